@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from . import auth, dashboard, inventory, projects, tickets, users, wikis
+from . import auth, changes, dashboard, inventory, projects, search, sla, tickets, users, wikis
 
 api_router = APIRouter(prefix="/api")
 
@@ -11,3 +11,6 @@ api_router.include_router(tickets.router, prefix="/tickets", tags=["tickets"])
 api_router.include_router(wikis.router, prefix="/wikis", tags=["wikis"])
 api_router.include_router(inventory.router, prefix="/inventory", tags=["inventory"])
 api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(changes.router, prefix="/changes", tags=["changes"])
+api_router.include_router(sla.router, prefix="/sla-policies", tags=["sla"])
@@ -1,13 +1,20 @@
 import logging
 import secrets
-from datetime import datetime
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db_session
-from app.core.security import create_access_token, get_password_hash, verify_password
+from app.core.challenge_store import Challenge, challenge_store
+from app.core.config import settings
+from app.core.rate_limit import client_ip, rate_limiter
+from app.core.security import (
+    create_access_token,
+    get_password_hash,
+    password_needs_rehash,
+    verify_password,
+)
 from app.models.two_factor import TwoFactorToken
 from app.models.user import User
 from app.schemas.auth import (
@@ -26,8 +33,10 @@ router = APIRouter()
 @router.post("/login", response_model=LoginResponse)
 def login(
     login_data: LoginRequest,
+    ip: str = Depends(client_ip),
     db: Session = Depends(get_db_session),
 ) -> LoginResponse:
+    rate_limiter.check("login", ip=ip, email=login_data.email)
     email = login_data.email
     password = login_data.password
 
@@ -41,20 +50,16 @@ def login(
     if not user.is_active:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Usuario inactivo")
 
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = get_password_hash(password)
+        db.commit()
+
     if user.two_factor_enabled:
         token_value = uuid4().hex
         code = f"{secrets.randbelow(1000000):06d}"
-        expires_at = TwoFactorToken.expiry()
+        expires_at = TwoFactorToken.expiry(settings.two_factor_ttl_minutes)
 
-        db.query(TwoFactorToken).filter(TwoFactorToken.user_id == user.id).delete(synchronize_session=False)
-        two_factor = TwoFactorToken(
-            user_id=user.id,
-            token=token_value,
-            code=code,
-            expires_at=expires_at,
-        )
-        db.add(two_factor)
-        db.commit()
+        challenge_store.create(Challenge(token=token_value, user_id=user.id, code=code, expires_at=expires_at))
         logger.info("2FA CODE for %s: %s", user.email, code)
 
         return LoginResponse(
@@ -69,38 +74,42 @@ def login(
 
 
 @router.post("/verify-2fa", response_model=Token)
-def verify_two_factor(request: TwoFactorVerifyRequest, db: Session = Depends(get_db_session)) -> Token:
-    record = (
-        db.query(TwoFactorToken)
-        .filter(TwoFactorToken.token == request.token)
-        .first()
-    )
-    if not record:
+def verify_two_factor(
+    request: TwoFactorVerifyRequest,
+    ip: str = Depends(client_ip),
+    db: Session = Depends(get_db_session),
+) -> Token:
+    rate_limiter.check("verify", ip=ip, token=request.token)
+    challenge = challenge_store.get(request.token)
+    if not challenge:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Token 2FA no encontrado")
 
-    if record.expires_at < datetime.utcnow():
-        db.delete(record)
-        db.commit()
+    if challenge.expired:
+        challenge_store.delete(challenge.token)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Código expirado")
 
-    if record.code != request.code:
+    if not secrets.compare_digest(challenge.code.encode(), request.code.encode()):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Código inválido")
 
-    user = db.query(User).filter(User.id == record.user_id).first()
+    user = db.query(User).filter(User.id == challenge.user_id).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado")
     if not user.is_active:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Usuario inactivo")
 
     access_token = create_access_token(user.email)
-    db.delete(record)
-    db.commit()
+    challenge_store.delete(challenge.token)
 
     return Token(access_token=access_token, user=UserOut.from_orm(user))
 
 
 @router.post("/register", response_model=UserOut, status_code=status.HTTP_201_CREATED)
-def register(user_in: UserCreate, db: Session = Depends(get_db_session)) -> UserOut:
+def register(
+    user_in: UserCreate,
+    ip: str = Depends(client_ip),
+    db: Session = Depends(get_db_session),
+) -> UserOut:
+    rate_limiter.check("register", ip=ip, email=user_in.email)
     existing = db.query(User).filter(User.email == user_in.email).first()
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email ya registrado")
@@ -0,0 +1,89 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Set, Tuple
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_async_current_user, get_async_read_db_session
+from app.api.projection import rows_to_dicts, schema_columns
+from app.core.config import settings
+from app.models.change_log import ChangeEntity, ChangeLogEntry
+from app.models.inventory import InventoryItem
+from app.models.project import Project
+from app.models.ticket import Ticket
+from app.models.user import User
+from app.models.wiki import WikiPage
+from app.schemas.change import ChangePage
+from app.schemas.inventory import InventoryOut
+from app.schemas.project import ProjectOut
+from app.schemas.ticket import TicketOut
+from app.schemas.wiki import WikiOut
+
+router = APIRouter()
+
+ENTITIES = {
+    ChangeEntity.TICKET: (Ticket, TicketOut),
+    ChangeEntity.PROYECTO: (Project, ProjectOut),
+    ChangeEntity.WIKI: (WikiPage, WikiOut),
+    ChangeEntity.INVENTARIO: (InventoryItem, InventoryOut),
+}
+
+
+async def _load_rows(db: AsyncSession, pending: Dict[ChangeEntity, Set[int]]) -> Dict[Tuple[ChangeEntity, int], Dict[str, Any]]:
+    loaded = {}
+    for entity, ids in pending.items():
+        model, schema = ENTITIES[entity]
+        names = list(schema.__fields__)
+        result = await db.execute(select(*schema_columns(model, schema)).where(model.id.in_(ids)))
+        for row in rows_to_dicts(result.all(), names):
+            loaded[(entity, row["id"])] = row
+    return loaded
+
+
+@router.get("/", response_model=ChangePage, response_class=ORJSONResponse)
+async def list_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=2000),
+    entities: List[ChangeEntity] = Query([], alias="entity"),
+    db: AsyncSession = Depends(get_async_read_db_session),
+    _: User = Depends(get_async_current_user),
+) -> ORJSONResponse:
+    settled_at = datetime.utcnow() - timedelta(seconds=settings.change_feed_settle_seconds)
+    unsettled = await db.scalar(
+        select(func.min(ChangeLogEntry.id)).where(ChangeLogEntry.id > since, ChangeLogEntry.created_at > settled_at)
+    )
+    statement = select(ChangeLogEntry).where(ChangeLogEntry.id > since)
+    if unsettled is not None:
+        statement = statement.where(ChangeLogEntry.id < unsettled)
+    if entities:
+        statement = statement.where(ChangeLogEntry.entity.in_(entities))
+    entries = (await db.scalars(statement.order_by(ChangeLogEntry.id).limit(limit + 1))).all()
+
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    pending: Dict[ChangeEntity, Set[int]] = defaultdict(set)
+    for entry in entries:
+        if not entry.deleted:
+            pending[entry.entity].add(entry.entity_id)
+    loaded = await _load_rows(db, pending)
+
+    items = []
+    for entry in entries:
+        data = loaded.get((entry.entity, entry.entity_id))
+        if not entry.deleted and data is None:
+            continue
+        items.append(
+            {
+                "seq": entry.id,
+                "entity": entry.entity,
+                "id": entry.entity_id,
+                "deleted": entry.deleted,
+                "changed_at": entry.created_at,
+                "data": data,
+            }
+        )
+    next_since = entries[-1].id if entries else since
+    return ORJSONResponse({"items": items, "next_since": next_since, "has_more": has_more})
@@ -1,41 +1,60 @@
-from collections import Counter
-from typing import Dict
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user, get_db_session
+from app.api.deps import get_async_current_user, get_async_read_db_session
 from app.models.inventory import InventoryItem
 from app.models.project import Project
-from app.models.ticket import Ticket
+from app.models.ticket import TicketPriority
 from app.models.user import User
 from app.models.wiki import WikiPage
+from app.services import ticket_counters, ticket_rollups
+from app.services.ticket_rollups import Granularity
 
 router = APIRouter()
 
 
 @router.get("/stats")
-def dashboard_stats(
-    db: Session = Depends(get_db_session),
-    _: User = Depends(get_current_user),
+async def dashboard_stats(
+    db: AsyncSession = Depends(get_async_read_db_session),
+    _: User = Depends(get_async_current_user),
 ) -> Dict[str, Dict[str, int]]:
-    projects_count = db.query(Project).count()
-    tickets_count = db.query(Ticket).count()
-    users_count = db.query(User).count()
-    inventory_count = db.query(InventoryItem).count()
-    wikis_count = db.query(WikiPage).count()
+    projects_count = await db.scalar(select(func.count()).select_from(Project))
+    users_count = await db.scalar(select(func.count()).select_from(User))
+    inventory_count = await db.scalar(select(func.count()).select_from(InventoryItem))
+    wikis_count = await db.scalar(select(func.count()).select_from(WikiPage))
 
-    status_counts = Counter(
-        status for (status,) in db.query(Ticket.status).all()
-    )
+    status_counts = await db.run_sync(ticket_counters.status_totals)
 
     return {
         "totals": {
             "projects": projects_count,
-            "tickets": tickets_count,
+            "tickets": sum(status_counts.values()),
             "users": users_count,
             "inventory": inventory_count,
             "wikis": wikis_count,
         },
         "tickets_by_status": {status.value: count for status, count in status_counts.items()},
     }
+
+
+@router.get("/timeseries")
+async def dashboard_timeseries(
+    project_id: Optional[int] = Query(None),
+    priority: Optional[TicketPriority] = Query(None),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    granularity: Granularity = Query(Granularity.DAY),
+    db: AsyncSession = Depends(get_async_read_db_session),
+    _: User = Depends(get_async_current_user),
+) -> List[Dict[str, Any]]:
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - timedelta(days=29)
+    if date_from > date_to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El rango de fechas no es válido")
+    if (date_to - date_from).days > 3660:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El rango máximo es de diez años")
+    return await db.run_sync(ticket_rollups.timeseries, date_from, date_to, granularity, project_id, priority)
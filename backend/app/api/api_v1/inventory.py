@@ -1,27 +1,59 @@
+import csv
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.api.deps import (
     get_current_project_manager,
     get_current_user,
     get_db_session,
+    get_read_db_session,
+    get_read_sessionmaker,
 )
+from app.api.etag import is_not_modified, make_etag, not_modified
+from app.api.projection import rows_to_dicts, schema_columns
+from app.api.streaming import ExportFormat, export_response
+from app.models.change_log import ChangeEntity
 from app.models.inventory import InventoryItem
 from app.models.user import User
-from app.schemas.inventory import InventoryCreate, InventoryOut, InventoryUpdate
+from app.schemas.inventory import InventoryCreate, InventoryImportSummary, InventoryOut, InventoryUpdate
+from app.services import change_feed
+from app.services.inventory_import import import_csv
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[InventoryOut])
+@router.get("/", response_model=List[InventoryOut], response_class=ORJSONResponse)
 def list_inventory(
-    db: Session = Depends(get_db_session),
+    request: Request,
+    db: Session = Depends(get_read_db_session),
+    _: User = Depends(get_current_user),
+) -> Response:
+    version = db.execute(
+        select(
+            func.max(InventoryItem.updated_at), func.count(), change_feed.sequence(ChangeEntity.INVENTARIO)
+        ).select_from(InventoryItem)
+    ).one()
+    etag = make_etag("inventory", *version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    statement = select(*schema_columns(InventoryItem, InventoryOut)).order_by(InventoryItem.updated_at.desc())
+    rows = db.execute(statement).all()
+    return ORJSONResponse(rows_to_dicts(rows, list(InventoryOut.__fields__)), headers={"ETag": etag})
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_inventory(
+    fmt: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    session_factory: sessionmaker = Depends(get_read_sessionmaker),
     _: User = Depends(get_current_user),
-) -> List[InventoryOut]:
-    items = db.query(InventoryItem).order_by(InventoryItem.updated_at.desc()).all()
-    return [InventoryOut.from_orm(item) for item in items]
+) -> StreamingResponse:
+    statement = select(*schema_columns(InventoryItem, InventoryOut)).order_by(InventoryItem.id)
+    return export_response(statement, list(InventoryOut.__fields__), fmt, "inventory", session_factory)
 
 
 @router.post("/", response_model=InventoryOut, status_code=status.HTTP_201_CREATED)
@@ -32,11 +64,25 @@ def create_inventory_item(
 ) -> InventoryOut:
     item = InventoryItem(**item_in.dict())
     db.add(item)
+    db.flush()
+    change_feed.record(db, ChangeEntity.INVENTARIO, [item.id])
     db.commit()
     db.refresh(item)
     return InventoryOut.from_orm(item)
 
 
+@router.post("/import", response_model=InventoryImportSummary)
+def import_inventory(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db_session),
+    _: User = Depends(get_current_project_manager),
+) -> InventoryImportSummary:
+    try:
+        return import_csv(db, file.file)
+    except (UnicodeDecodeError, csv.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El fichero no es un CSV UTF-8 válido")
+
+
 @router.put("/{item_id}", response_model=InventoryOut)
 def update_inventory_item(
     item_id: int,
@@ -51,6 +97,7 @@ def update_inventory_item(
     for field, value in item_in.dict(exclude_unset=True).items():
         setattr(item, field, value)
     db.add(item)
+    change_feed.record(db, ChangeEntity.INVENTARIO, [item.id])
     db.commit()
     db.refresh(item)
     return InventoryOut.from_orm(item)
@@ -66,4 +113,5 @@ def delete_inventory_item(
     if not item:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item no encontrado")
     db.delete(item)
+    change_feed.record_deleted(db, ChangeEntity.INVENTARIO, [item_id])
     db.commit()
@@ -1,73 +1,119 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.deps import (
-    get_current_admin,
-    get_current_project_manager,
-    get_db_session,
+    get_async_current_admin,
+    get_async_current_project_manager,
+    get_async_db_session,
+    get_async_read_db_session,
 )
+from app.api.etag import is_not_modified, make_etag, not_modified
+from app.models.change_log import ChangeEntity
 from app.models.project import Project
 from app.schemas.project import ProjectCreate, ProjectOut, ProjectUpdate
+from app.services import change_feed, sla, ticket_counters, ticket_rollups
 
 router = APIRouter()
 
 
+def _project_deleted(db: Session, project_id: int) -> None:
+    ticket_counters.project_deleted(db, project_id)
+    ticket_rollups.project_deleted(db, project_id)
+    sla.project_deleted(db, project_id)
+
+
 @router.get("/", response_model=List[ProjectOut])
-def list_projects(db: Session = Depends(get_db_session)) -> List[ProjectOut]:
-    projects = db.query(Project).order_by(Project.created_at.desc()).all()
+async def list_projects(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db_session),
+) -> List[ProjectOut]:
+    version = await db.execute(
+        select(func.max(Project.updated_at), func.count(), change_feed.sequence(ChangeEntity.PROYECTO)).select_from(Project)
+    )
+    etag = make_etag("projects", *version.one())
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    projects = await db.scalars(select(Project).order_by(Project.created_at.desc()))
     return [ProjectOut.from_orm(project) for project in projects]
 
 
 @router.get("/{project_id}", response_model=ProjectOut)
-def get_project(project_id: int, db: Session = Depends(get_db_session)) -> ProjectOut:
-    project = db.query(Project).filter(Project.id == project_id).first()
+async def get_project(
+    project_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db_session),
+) -> ProjectOut:
+    version = (
+        await db.execute(
+            select(Project.updated_at, change_feed.sequence(ChangeEntity.PROYECTO, project_id)).where(Project.id == project_id)
+        )
+    ).first()
+    if version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Proyecto no encontrado")
+    etag = make_etag("project", project_id, *version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Proyecto no encontrado")
     return ProjectOut.from_orm(project)
 
 
 @router.post("/", response_model=ProjectOut, status_code=status.HTTP_201_CREATED)
-def create_project(
+async def create_project(
     project_in: ProjectCreate,
-    db: Session = Depends(get_db_session),
-    _: None = Depends(get_current_project_manager),
+    db: AsyncSession = Depends(get_async_db_session),
+    _: None = Depends(get_async_current_project_manager),
 ) -> ProjectOut:
     project = Project(**project_in.dict())
     db.add(project)
-    db.commit()
-    db.refresh(project)
+    await db.flush()
+    await db.run_sync(change_feed.record, ChangeEntity.PROYECTO, [project.id])
+    await db.commit()
+    await db.refresh(project)
     return ProjectOut.from_orm(project)
 
 
 @router.put("/{project_id}", response_model=ProjectOut)
-def update_project(
+async def update_project(
     project_id: int,
     project_in: ProjectUpdate,
-    db: Session = Depends(get_db_session),
-    _: None = Depends(get_current_project_manager),
+    db: AsyncSession = Depends(get_async_db_session),
+    _: None = Depends(get_async_current_project_manager),
 ) -> ProjectOut:
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Proyecto no encontrado")
 
     for field, value in project_in.dict(exclude_unset=True).items():
         setattr(project, field, value)
     db.add(project)
-    db.commit()
-    db.refresh(project)
+    await db.run_sync(change_feed.record, ChangeEntity.PROYECTO, [project.id])
+    await db.commit()
+    await db.refresh(project)
     return ProjectOut.from_orm(project)
 
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_project(
+async def delete_project(
     project_id: int,
-    db: Session = Depends(get_db_session),
-    _: None = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db_session),
+    _: None = Depends(get_async_current_admin),
 ) -> None:
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Proyecto no encontrado")
-    db.delete(project)
-    db.commit()
+    await db.run_sync(_project_deleted, project_id)
+    await db.delete(project)
+    await db.run_sync(change_feed.record_deleted, ChangeEntity.PROYECTO, [project_id])
+    await db.commit()
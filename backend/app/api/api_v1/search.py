@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_user, get_read_db_session
+from app.models.user import User
+from app.schemas.search import SearchPage
+from app.services import search
+
+router = APIRouter()
+
+
+@router.get("", response_model=SearchPage)
+def search_content(
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    db: Session = Depends(get_read_db_session),
+    _: User = Depends(get_current_user),
+) -> SearchPage:
+    hits = search.search(db, q, limit + 1, offset)
+    next_offset = offset + limit if len(hits) > limit else None
+    return SearchPage(items=hits[:limit], next_offset=next_offset)
@@ -0,0 +1,84 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import (
+    get_async_current_admin,
+    get_async_current_user,
+    get_async_db_session,
+    get_async_read_db_session,
+)
+from app.models.project import Project
+from app.models.sla import SlaPolicy
+from app.models.user import User
+from app.schemas.sla import SlaPolicyCreate, SlaPolicyOut, SlaPolicyUpdate
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[SlaPolicyOut])
+async def list_sla_policies(
+    db: AsyncSession = Depends(get_async_read_db_session),
+    _: User = Depends(get_async_current_user),
+) -> List[SlaPolicyOut]:
+    policies = await db.scalars(select(SlaPolicy).order_by(SlaPolicy.project_id, SlaPolicy.priority))
+    return [SlaPolicyOut.from_orm(policy) for policy in policies]
+
+
+@router.post("/", response_model=SlaPolicyOut, status_code=status.HTTP_201_CREATED)
+async def create_sla_policy(
+    policy_in: SlaPolicyCreate,
+    db: AsyncSession = Depends(get_async_db_session),
+    _: User = Depends(get_async_current_admin),
+) -> SlaPolicyOut:
+    if policy_in.project_id is not None and await db.get(Project, policy_in.project_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Proyecto no encontrado")
+    project_condition = (
+        SlaPolicy.project_id.is_(None) if policy_in.project_id is None else SlaPolicy.project_id == policy_in.project_id
+    )
+    existing = await db.scalar(select(SlaPolicy.id).where(project_condition, SlaPolicy.priority == policy_in.priority))
+    if existing is not None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ya existe una política de SLA para ese proyecto y prioridad")
+
+    policy = SlaPolicy(**policy_in.dict())
+    db.add(policy)
+    await db.commit()
+    await db.refresh(policy)
+    return SlaPolicyOut.from_orm(policy)
+
+
+@router.put("/{policy_id}", response_model=SlaPolicyOut)
+async def update_sla_policy(
+    policy_id: int,
+    policy_in: SlaPolicyUpdate,
+    db: AsyncSession = Depends(get_async_db_session),
+    _: User = Depends(get_async_current_admin),
+) -> SlaPolicyOut:
+    policy = await db.get(SlaPolicy, policy_id)
+    if not policy:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Política de SLA no encontrada")
+
+    changes = policy_in.dict(exclude_unset=True)
+    if "resolution_minutes" in changes and changes["resolution_minutes"] is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El tiempo de resolución es obligatorio")
+    for field, value in changes.items():
+        setattr(policy, field, value)
+    db.add(policy)
+    await db.commit()
+    await db.refresh(policy)
+    return SlaPolicyOut.from_orm(policy)
+
+
+@router.delete("/{policy_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_sla_policy(
+    policy_id: int,
+    db: AsyncSession = Depends(get_async_db_session),
+    _: User = Depends(get_async_current_admin),
+) -> None:
+    policy = await db.get(SlaPolicy, policy_id)
+    if not policy:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Política de SLA no encontrada")
+    await db.delete(policy)
+    await db.commit()
@@ -1,89 +1,495 @@
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import String, cast, func, literal, select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.api.deps import (
-    get_current_admin,
-    get_current_user,
-    get_db_session,
+    get_async_current_admin,
+    get_async_current_user,
+    get_async_db_session,
+    get_async_read_db_session,
+    get_read_sessionmaker,
 )
-from app.models.ticket import Ticket, TicketStatus
+from app.api.etag import is_not_modified, make_etag, not_modified
+from app.api.projection import rows_to_dicts, schema_columns
+from app.api.streaming import ExportFormat, export_response
+from app.core.config import settings
+from app.core.event_broker import event_broker
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.models.change_log import ChangeEntity
+from app.models.project import Project
+from app.models.ticket import Ticket, TicketPriority, TicketStatus
+from app.models.ticket_activity import TicketActivity
 from app.models.user import User, UserRole
-from app.schemas.ticket import TicketCreate, TicketOut, TicketUpdate
+from app.schemas.ticket import (
+    AssigneeFacet,
+    TicketActivityOut,
+    TicketActivityPage,
+    TicketBulkResponse,
+    TicketBulkResult,
+    TicketBulkUpdateItem,
+    TicketCreate,
+    TicketFacets,
+    TicketFilters,
+    TicketOut,
+    TicketPage,
+    TicketUpdate,
+)
+from app.services import change_feed, outbox, search, sla, ticket_activity, ticket_counters, ticket_rollups
 
 router = APIRouter()
 
+TicketChange = Tuple[Optional[Tuple[int, TicketStatus]], Ticket]
+
+TICKETS_TOPIC = "tickets"
+
+REQUIRED_FIELDS = {column.name for column in Ticket.__table__.columns if not column.nullable}
+
+
+def _tickets_written(db: Session, changes: List[TicketChange], actor_id: Optional[int] = None) -> None:
+    events = outbox.collect_ticket_events(changes)
+    activity = ticket_activity.collect_changes(changes)
+    rollups = ticket_rollups.track_resolution(changes)
+    sla.update_deadlines(db, changes)
+    db.flush()
+    ticket_counters.tickets_changed(db, changes)
+    ticket_rollups.tickets_changed(db, rollups)
+    for _, ticket in changes:
+        search.index_ticket(db, ticket)
+    outbox.enqueue_ticket_events(db, events)
+    change_feed.record(db, ChangeEntity.TICKET, [ticket.id for _, ticket in changes])
+    ticket_activity.record(db, activity, actor_id)
+
+
+def _ticket_deleted(db: Session, ticket: Ticket, actor_id: Optional[int] = None) -> None:
+    ticket_counters.ticket_deleted(db, ticket)
+    ticket_rollups.ticket_deleted(db, ticket)
+    search.remove_ticket(db, ticket.id)
+    ticket_activity.record_deleted(db, ticket, actor_id)
+    change_feed.record_deleted(db, ChangeEntity.TICKET, [ticket.id])
+
+
+def _publish_ticket(event: str, ticket: TicketOut, previous: Optional[Tuple[int, TicketStatus]] = None) -> None:
+    project_ids, statuses = [ticket.project_id], [ticket.status.value]
+    if previous is not None:
+        project_ids.append(previous[0])
+        statuses.append(previous[1].value)
+    event_broker.publish(
+        TICKETS_TOPIC,
+        event,
+        {"ticket": ticket.dict(), "previous": None if previous is None else {"project_id": previous[0], "status": previous[1].value}},
+        {"project_id": project_ids, "status": statuses},
+    )
+
+
+def _ticket_filters(
+    project_id: Optional[int] = Query(None),
+    statuses: List[TicketStatus] = Query([], alias="status"),
+    priorities: List[TicketPriority] = Query([], alias="priority"),
+    assignee_id: Optional[int] = Query(None),
+    reporter_id: Optional[int] = Query(None),
+    created_from: Optional[datetime] = Query(None),
+    created_to: Optional[datetime] = Query(None),
+    updated_from: Optional[datetime] = Query(None),
+    updated_to: Optional[datetime] = Query(None),
+) -> TicketFilters:
+    return TicketFilters(
+        project_id=project_id,
+        statuses=statuses,
+        priorities=priorities,
+        assignee_id=assignee_id,
+        reporter_id=reporter_id,
+        created_from=created_from,
+        created_to=created_to,
+        updated_from=updated_from,
+        updated_to=updated_to,
+    )
+
+
+def _filter_tickets(statement, filters: TicketFilters):
+    if filters.project_id is not None:
+        statement = statement.where(Ticket.project_id == filters.project_id)
+    if filters.statuses:
+        statement = statement.where(Ticket.status.in_(filters.statuses))
+    if filters.priorities:
+        statement = statement.where(Ticket.priority.in_(filters.priorities))
+    if filters.assignee_id is not None:
+        statement = statement.where(Ticket.assignee_id == filters.assignee_id)
+    if filters.reporter_id is not None:
+        statement = statement.where(Ticket.reporter_id == filters.reporter_id)
+    if filters.created_from is not None:
+        statement = statement.where(Ticket.created_at >= filters.created_from)
+    if filters.created_to is not None:
+        statement = statement.where(Ticket.created_at < filters.created_to)
+    if filters.updated_from is not None:
+        statement = statement.where(Ticket.updated_at >= filters.updated_from)
+    if filters.updated_to is not None:
+        statement = statement.where(Ticket.updated_at < filters.updated_to)
+    return statement
+
+
+def _facet_select(name: str, column, filters: TicketFilters):
+    value = cast(column, String(32))
+    statement = select(literal(name).label("facet"), value.label("value"), func.count().label("total"))
+    return _filter_tickets(statement, filters).group_by(value)
+
+
+async def _ticket_facets(db: AsyncSession, filters: TicketFilters) -> TicketFacets:
+    statement = union_all(
+        _facet_select("status", Ticket.status, filters.copy(update={"statuses": []})),
+        _facet_select("priority", Ticket.priority, filters.copy(update={"priorities": []})),
+        _facet_select("assignee", Ticket.assignee_id, filters.copy(update={"assignee_id": None})),
+    )
+    facets = TicketFacets()
+    for facet, value, total in (await db.execute(statement)).all():
+        if facet == "status":
+            facets.status[TicketStatus[value]] = total
+        elif facet == "priority":
+            facets.priority[TicketPriority[value]] = total
+        else:
+            facets.assignee.append(AssigneeFacet(assignee_id=None if value is None else int(value), count=total))
+    facets.assignee.sort(key=lambda bucket: -bucket.count)
+    return facets
+
+
+def _can_update(user: User, ticket: Ticket) -> bool:
+    return user.role in {UserRole.ADMIN, UserRole.JEFE_PROYECTO} or user.id in {ticket.reporter_id, ticket.assignee_id}
+
+
+def _missing_required(changes: Dict[str, object]) -> List[str]:
+    return sorted(field for field, value in changes.items() if value is None and field in REQUIRED_FIELDS)
+
+
+def _check_bulk_size(items: List) -> None:
+    if len(items) > settings.ticket_bulk_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Máximo {settings.ticket_bulk_max_items} tickets por petición",
+        )
+
+
+async def _existing_ids(db: AsyncSession, column, ids: Set[int]) -> Set[int]:
+    if not ids:
+        return set()
+    result = await db.scalars(select(column).where(column.in_(ids)))
+    return set(result.all())
+
+
+def _bulk_response(results: List[TicketBulkResult]) -> TicketBulkResponse:
+    results.sort(key=lambda result: result.index)
+    succeeded = sum(1 for result in results if result.ok)
+    return TicketBulkResponse(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
+
+@router.get("/", response_model=TicketPage, response_class=ORJSONResponse)
+async def list_tickets(
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db_session),
+    filters: TicketFilters = Depends(_ticket_filters),
+    limit: int = Query(50, ge=1, le=200),
+    after: Optional[str] = Query(None),
+    facets: bool = Query(False),
+) -> Response:
+    version = await db.execute(
+        _filter_tickets(select(func.max(Ticket.updated_at), func.count(), change_feed.sequence(ChangeEntity.TICKET)), filters)
+    )
+    etag = make_etag("tickets", *version.one(), filters.json(), limit, after, facets)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
 
-@router.get("/", response_model=List[TicketOut])
-def list_tickets(
-    db: Session = Depends(get_db_session),
+    query = _filter_tickets(select(*schema_columns(Ticket, TicketOut)), filters)
+    if after is not None:
+        try:
+            cursor_created_at, cursor_id = decode_cursor(after)
+        except InvalidCursorError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+        query = query.where(tuple_(Ticket.created_at, Ticket.id) < tuple_(cursor_created_at, cursor_id))
+    result = await db.execute(query.order_by(Ticket.created_at.desc(), Ticket.id.desc()).limit(limit + 1))
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    page = {"items": rows_to_dicts(rows, list(TicketOut.__fields__)), "next_cursor": next_cursor, "facets": None}
+    if facets:
+        page["facets"] = (await _ticket_facets(db, filters)).dict()
+    return ORJSONResponse(page, headers={"ETag": etag})
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_tickets(
+    filters: TicketFilters = Depends(_ticket_filters),
+    fmt: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    session_factory: sessionmaker = Depends(get_read_sessionmaker),
+    _: User = Depends(get_async_current_user),
+) -> StreamingResponse:
+    statement = _filter_tickets(select(*schema_columns(Ticket, TicketOut)), filters)
+    return export_response(statement.order_by(Ticket.id), list(TicketOut.__fields__), fmt, "tickets", session_factory)
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_tickets(
+    request: Request,
+    project_id: Optional[int] = Query(None),
+    statuses: List[TicketStatus] = Query([], alias="status"),
+    _: User = Depends(get_async_current_user),
+) -> StreamingResponse:
+    if event_broker.full:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Demasiados clientes conectados al flujo de tickets")
+    events = event_broker.stream(
+        TICKETS_TOPIC,
+        resync="last-event-id" in request.headers,
+        project_id=[project_id],
+        status=[item.value for item in statuses],
+    )
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/sla-breaches", response_model=TicketPage, response_class=ORJSONResponse)
+async def list_sla_breaches(
     project_id: Optional[int] = Query(None),
-    status_filter: Optional[TicketStatus] = Query(None, alias="status"),
-) -> List[TicketOut]:
-    query = db.query(Ticket)
+    upcoming_minutes: int = Query(0, ge=0, le=7 * 24 * 60),
+    limit: int = Query(50, ge=1, le=200),
+    after: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db_session),
+    _: User = Depends(get_async_current_user),
+) -> Response:
+    horizon = datetime.utcnow() + timedelta(minutes=upcoming_minutes)
+    query = select(*schema_columns(Ticket, TicketOut)).where(Ticket.sla_due_at <= horizon)
     if project_id is not None:
-        query = query.filter(Ticket.project_id == project_id)
-    if status_filter is not None:
-        query = query.filter(Ticket.status == status_filter)
-    tickets = query.order_by(Ticket.created_at.desc()).all()
-    return [TicketOut.from_orm(ticket) for ticket in tickets]
+        query = query.where(Ticket.project_id == project_id)
+    if after is not None:
+        try:
+            cursor_due_at, cursor_id = decode_cursor(after)
+        except InvalidCursorError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+        query = query.where(tuple_(Ticket.sla_due_at, Ticket.id) > tuple_(cursor_due_at, cursor_id))
+    rows = (await db.execute(query.order_by(Ticket.sla_due_at, Ticket.id).limit(limit + 1))).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].sla_due_at, rows[-1].id)
+    return ORJSONResponse({"items": rows_to_dicts(rows, list(TicketOut.__fields__)), "next_cursor": next_cursor, "facets": None})
+
+
+@router.post("/bulk", response_model=TicketBulkResponse)
+async def bulk_create_tickets(
+    tickets_in: List[TicketCreate],
+    db: AsyncSession = Depends(get_async_db_session),
+    current_user: User = Depends(get_async_current_user),
+) -> TicketBulkResponse:
+    _check_bulk_size(tickets_in)
+    project_ids = await _existing_ids(db, Project.id, {item.project_id for item in tickets_in})
+    user_ids = await _existing_ids(
+        db,
+        User.id,
+        {item.reporter_id for item in tickets_in} | {item.assignee_id for item in tickets_in if item.assignee_id is not None},
+    )
+
+    results: List[TicketBulkResult] = []
+    created: Dict[int, Ticket] = {}
+    for index, item in enumerate(tickets_in):
+        if current_user.role != UserRole.ADMIN and item.reporter_id != current_user.id:
+            error = "No puedes crear tickets en nombre de otros usuarios"
+        elif item.project_id not in project_ids:
+            error = "Proyecto no encontrado"
+        elif item.reporter_id not in user_ids or (item.assignee_id is not None and item.assignee_id not in user_ids):
+            error = "Usuario no encontrado"
+        else:
+            created[index] = Ticket(**item.dict())
+            continue
+        results.append(TicketBulkResult(index=index, ok=False, error=error))
+
+    if created:
+        db.add_all(created.values())
+        await db.run_sync(_tickets_written, [(None, ticket) for ticket in created.values()])
+        await db.commit()
+    for index, ticket in created.items():
+        ticket_out = TicketOut.from_orm(ticket)
+        _publish_ticket("ticket.created", ticket_out)
+        results.append(TicketBulkResult(index=index, ok=True, ticket=ticket_out))
+    return _bulk_response(results)
+
+
+@router.patch("/bulk", response_model=TicketBulkResponse)
+async def bulk_update_tickets(
+    tickets_in: List[TicketBulkUpdateItem],
+    db: AsyncSession = Depends(get_async_db_session),
+    current_user: User = Depends(get_async_current_user),
+) -> TicketBulkResponse:
+    _check_bulk_size(tickets_in)
+    tickets_by_id = {
+        ticket.id: ticket
+        for ticket in await db.scalars(select(Ticket).where(Ticket.id.in_({item.id for item in tickets_in})))
+    }
+    user_ids = await _existing_ids(db, User.id, {item.assignee_id for item in tickets_in if item.assignee_id is not None})
+
+    results: List[TicketBulkResult] = []
+    updated: Dict[int, Ticket] = {}
+    moves: List[TicketChange] = []
+    seen: Set[int] = set()
+    for index, item in enumerate(tickets_in):
+        ticket = tickets_by_id.get(item.id)
+        changes = item.dict(exclude_unset=True, exclude={"id"})
+        duplicate = item.id in seen
+        seen.add(item.id)
+        if duplicate:
+            results.append(TicketBulkResult(index=index, ok=False, error="Ticket repetido en la petición"))
+        elif not ticket:
+            results.append(TicketBulkResult(index=index, ok=False, error="Ticket no encontrado"))
+        elif not _can_update(current_user, ticket):
+            results.append(TicketBulkResult(index=index, ok=False, error="No tienes permisos para actualizar este ticket"))
+        elif changes.get("assignee_id") is not None and changes["assignee_id"] not in user_ids:
+            results.append(TicketBulkResult(index=index, ok=False, error="Usuario no encontrado"))
+        elif _missing_required(changes):
+            error = f"Campos obligatorios sin valor: {', '.join(_missing_required(changes))}"
+            results.append(TicketBulkResult(index=index, ok=False, error=error))
+        else:
+            previous = (ticket.project_id, ticket.status)
+            for field, value in changes.items():
+                setattr(ticket, field, value)
+            moves.append((previous, ticket))
+            updated[index] = ticket
+
+    if updated:
+        await db.run_sync(_tickets_written, moves, current_user.id)
+        await db.commit()
+    previous_by_id = {ticket.id: previous for previous, ticket in moves}
+    for index, ticket in updated.items():
+        ticket_out = TicketOut.from_orm(ticket)
+        _publish_ticket("ticket.updated", ticket_out, previous_by_id[ticket.id])
+        results.append(TicketBulkResult(index=index, ok=True, ticket=ticket_out))
+    return _bulk_response(results)
 
 
 @router.get("/{ticket_id}", response_model=TicketOut)
-def get_ticket(ticket_id: int, db: Session = Depends(get_db_session)) -> TicketOut:
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+async def get_ticket(
+    ticket_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db_session),
+) -> TicketOut:
+    version = (
+        await db.execute(
+            select(Ticket.updated_at, change_feed.sequence(ChangeEntity.TICKET, ticket_id)).where(Ticket.id == ticket_id)
+        )
+    ).first()
+    if version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ticket no encontrado")
+    etag = make_etag("ticket", ticket_id, *version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    ticket = await db.get(Ticket, ticket_id)
     if not ticket:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ticket no encontrado")
     return TicketOut.from_orm(ticket)
 
 
+@router.get("/{ticket_id}/activity", response_model=TicketActivityPage)
+async def list_ticket_activity(
+    ticket_id: int,
+    db: AsyncSession = Depends(get_async_read_db_session),
+    limit: int = Query(50, ge=1, le=200),
+    before: Optional[str] = Query(None),
+    _: User = Depends(get_async_current_user),
+) -> TicketActivityPage:
+    if (
+        await db.scalar(select(Ticket.id).where(Ticket.id == ticket_id)) is None
+        and await db.scalar(select(TicketActivity.id).where(TicketActivity.ticket_id == ticket_id).limit(1)) is None
+    ):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ticket no encontrado")
+
+    query = select(TicketActivity).where(TicketActivity.ticket_id == ticket_id)
+    if before is not None:
+        try:
+            cursor_created_at, cursor_id = decode_cursor(before)
+        except InvalidCursorError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+        query = query.where(tuple_(TicketActivity.created_at, TicketActivity.id) < tuple_(cursor_created_at, cursor_id))
+    entries = (
+        await db.scalars(query.order_by(TicketActivity.created_at.desc(), TicketActivity.id.desc()).limit(limit + 1))
+    ).all()
+
+    next_cursor = None
+    if len(entries) > limit:
+        entries = entries[:limit]
+        next_cursor = encode_cursor(entries[-1].created_at, entries[-1].id)
+    return TicketActivityPage(items=[TicketActivityOut.from_orm(entry) for entry in entries], next_cursor=next_cursor)
+
+
 @router.post("/", response_model=TicketOut, status_code=status.HTTP_201_CREATED)
-def create_ticket(
+async def create_ticket(
     ticket_in: TicketCreate,
-    db: Session = Depends(get_db_session),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db_session),
+    current_user: User = Depends(get_async_current_user),
 ) -> TicketOut:
     if current_user.role != UserRole.ADMIN and ticket_in.reporter_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No puedes crear tickets en nombre de otros usuarios")
 
     ticket = Ticket(**ticket_in.dict())
     db.add(ticket)
-    db.commit()
-    db.refresh(ticket)
-    return TicketOut.from_orm(ticket)
+    await db.run_sync(_tickets_written, [(None, ticket)])
+    await db.commit()
+    await db.refresh(ticket)
+    ticket_out = TicketOut.from_orm(ticket)
+    _publish_ticket("ticket.created", ticket_out)
+    return ticket_out
 
 
 @router.put("/{ticket_id}", response_model=TicketOut)
-def update_ticket(
+async def update_ticket(
     ticket_id: int,
     ticket_in: TicketUpdate,
-    db: Session = Depends(get_db_session),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db_session),
+    current_user: User = Depends(get_async_current_user),
 ) -> TicketOut:
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    ticket = await db.get(Ticket, ticket_id)
     if not ticket:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ticket no encontrado")
 
-    if current_user.role not in {UserRole.ADMIN, UserRole.JEFE_PROYECTO} and current_user.id not in {ticket.reporter_id, ticket.assignee_id}:
+    if not _can_update(current_user, ticket):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No tienes permisos para actualizar este ticket")
 
-    for field, value in ticket_in.dict(exclude_unset=True).items():
+    changes = ticket_in.dict(exclude_unset=True)
+    missing = _missing_required(changes)
+    if missing:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Campos obligatorios sin valor: {', '.join(missing)}")
+
+    old_project_id, old_status = ticket.project_id, ticket.status
+    for field, value in changes.items():
         setattr(ticket, field, value)
     db.add(ticket)
-    db.commit()
-    db.refresh(ticket)
-    return TicketOut.from_orm(ticket)
+    await db.run_sync(_tickets_written, [((old_project_id, old_status), ticket)], current_user.id)
+    await db.commit()
+    await db.refresh(ticket)
+    ticket_out = TicketOut.from_orm(ticket)
+    _publish_ticket("ticket.updated", ticket_out, (old_project_id, old_status))
+    return ticket_out
 
 
 @router.delete("/{ticket_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_ticket(
+async def delete_ticket(
     ticket_id: int,
-    db: Session = Depends(get_db_session),
-    _: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db_session),
+    current_user: User = Depends(get_async_current_admin),
 ) -> None:
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    ticket = await db.get(Ticket, ticket_id)
     if not ticket:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ticket no encontrado")
-    db.delete(ticket)
-    db.commit()
+    ticket_out = TicketOut.from_orm(ticket)
+    await db.delete(ticket)
+    await db.run_sync(_ticket_deleted, ticket, current_user.id)
+    await db.commit()
+    _publish_ticket("ticket.deleted", ticket_out)
@@ -3,7 +3,8 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_admin, get_current_user, get_db_session
+from app.api.deps import get_current_admin, get_current_user, get_db_session, get_read_db_session
+from app.core.auth_cache import auth_cache
 from app.core.security import get_password_hash
 from app.models.user import User
 from app.schemas.user import UserCreate, UserOut, UserUpdate
@@ -18,7 +19,7 @@ def read_me(current_user: User = Depends(get_current_user)) -> UserOut:
 
 @router.get("/", response_model=List[UserOut])
 def list_users(
-    db: Session = Depends(get_db_session),
+    db: Session = Depends(get_read_db_session),
     _: User = Depends(get_current_admin),
 ) -> List[UserOut]:
     users = db.query(User).order_by(User.created_at.desc()).all()
@@ -66,6 +67,7 @@ def update_user(
             setattr(user, field, value)
     db.add(user)
     db.commit()
+    auth_cache.invalidate_user(user_id)
     db.refresh(user)
     return UserOut.from_orm(user)
 
@@ -83,3 +85,4 @@ def delete_user(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado")
     db.delete(user)
     db.commit()
+    auth_cache.invalidate_user(user_id)
@@ -1,23 +1,33 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import (
     get_current_project_manager,
     get_current_user,
     get_db_session,
+    get_read_db_session,
 )
+from app.models.change_log import ChangeEntity
 from app.models.user import User, UserRole
 from app.models.wiki import WikiPage
-from app.schemas.wiki import WikiCreate, WikiOut, WikiUpdate
+from app.schemas.wiki import (
+    WikiCreate,
+    WikiOut,
+    WikiRevisionContent,
+    WikiRevisionDiff,
+    WikiRevisionOut,
+    WikiUpdate,
+)
+from app.services import change_feed, search, wiki_revisions
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[WikiOut])
 def list_wikis(
-    db: Session = Depends(get_db_session),
+    db: Session = Depends(get_read_db_session),
     _: User = Depends(get_current_user),
 ) -> List[WikiOut]:
     wikis = db.query(WikiPage).order_by(WikiPage.updated_at.desc()).all()
@@ -34,6 +44,10 @@ def create_wiki(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No tienes permisos para crear wikis")
     wiki = WikiPage(**wiki_in.dict())
     db.add(wiki)
+    db.flush()
+    search.index_wiki(db, wiki)
+    wiki_revisions.record_created(db, wiki)
+    change_feed.record(db, ChangeEntity.WIKI, [wiki.id])
     db.commit()
     db.refresh(wiki)
     return WikiOut.from_orm(wiki)
@@ -46,15 +60,19 @@ def update_wiki(
     db: Session = Depends(get_db_session),
     current_user: User = Depends(get_current_user),
 ) -> WikiOut:
-    wiki = db.query(WikiPage).filter(WikiPage.id == wiki_id).first()
+    wiki = db.query(WikiPage).filter(WikiPage.id == wiki_id).with_for_update().first()
     if not wiki:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wiki no encontrada")
     if current_user.role == UserRole.VISUALIZADOR:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No tienes permisos para editar wikis")
 
+    previous_title, previous_content = wiki.title, wiki.content
     for field, value in wiki_in.dict(exclude_unset=True).items():
         setattr(wiki, field, value)
     db.add(wiki)
+    search.index_wiki(db, wiki)
+    wiki_revisions.record_updated(db, wiki, previous_title, previous_content, current_user.id)
+    change_feed.record(db, ChangeEntity.WIKI, [wiki.id])
     db.commit()
     db.refresh(wiki)
     return WikiOut.from_orm(wiki)
@@ -69,5 +87,73 @@ def delete_wiki(
     wiki = db.query(WikiPage).filter(WikiPage.id == wiki_id).first()
     if not wiki:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wiki no encontrada")
+    wiki_revisions.delete_history(db, wiki_id)
     db.delete(wiki)
+    search.remove_wiki(db, wiki_id)
+    change_feed.record_deleted(db, ChangeEntity.WIKI, [wiki_id])
     db.commit()
+
+
+def _get_wiki_or_404(db: Session, wiki_id: int) -> WikiPage:
+    wiki = db.query(WikiPage).filter(WikiPage.id == wiki_id).first()
+    if not wiki:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wiki no encontrada")
+    return wiki
+
+
+@router.get("/{wiki_id}/revisions", response_model=List[WikiRevisionOut])
+def list_wiki_revisions(
+    wiki_id: int,
+    db: Session = Depends(get_read_db_session),
+    _: User = Depends(get_current_user),
+) -> List[WikiRevisionOut]:
+    _get_wiki_or_404(db, wiki_id)
+    return [
+        WikiRevisionOut(
+            revision=revision.revision,
+            author_id=revision.author_id,
+            title=revision.title,
+            is_snapshot=revision.is_snapshot,
+            content_size=revision.content_size,
+            stored_size=stored_size,
+            created_at=revision.created_at,
+        )
+        for revision, stored_size in wiki_revisions.list_revisions(db, wiki_id)
+    ]
+
+
+@router.get("/{wiki_id}/revisions/{revision}", response_model=WikiRevisionContent)
+def get_wiki_revision(
+    wiki_id: int,
+    revision: int,
+    db: Session = Depends(get_read_db_session),
+    _: User = Depends(get_current_user),
+) -> WikiRevisionContent:
+    _get_wiki_or_404(db, wiki_id)
+    try:
+        record, content = wiki_revisions.get_revision(db, wiki_id, revision)
+    except wiki_revisions.RevisionNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Revisión no encontrada")
+    return WikiRevisionContent(
+        revision=record.revision,
+        author_id=record.author_id,
+        title=record.title,
+        content=content,
+        created_at=record.created_at,
+    )
+
+
+@router.get("/{wiki_id}/diff", response_model=WikiRevisionDiff)
+def diff_wiki_revisions(
+    wiki_id: int,
+    from_revision: int = Query(..., alias="from"),
+    to_revision: int = Query(..., alias="to"),
+    db: Session = Depends(get_read_db_session),
+    _: User = Depends(get_current_user),
+) -> WikiRevisionDiff:
+    _get_wiki_or_404(db, wiki_id)
+    try:
+        diff = wiki_revisions.diff_revisions(db, wiki_id, from_revision, to_revision)
+    except wiki_revisions.RevisionNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Revisión no encontrada")
+    return WikiRevisionDiff(from_revision=from_revision, to_revision=to_revision, diff=diff)
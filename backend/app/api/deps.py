@@ -1,30 +1,65 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional, Set
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
 
-from app.core.security import verify_token
-from app.db.session import get_db
+from app.core.auth_cache import UserSnapshot, auth_cache
+from app.core.metrics import timed_async_checkout, timed_checkout
+from app.core.security import decode_access_token
+from app.db.routing import reads_from_primary
+from app.db.session import (
+    AsyncSessionLocal,
+    SessionLocal,
+    async_read_sessionmaker,
+    get_async_db,
+    get_db,
+    read_sessionmaker,
+)
 from app.models.user import User, UserRole
+from app.schemas.auth import TokenPayload
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
-    user_email = verify_token(token)
-    if not user_email:
+def _token_payload(token: str) -> TokenPayload:
+    payload = decode_access_token(token)
+    if not payload or not payload.sub:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido")
+    return payload
+
 
-    user = db.query(User).filter(User.email == user_email).first()
+def _cache_user(token: str, payload: TokenPayload, user: Optional[User]) -> UserSnapshot:
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Usuario no encontrado")
-    if not user.is_active:
+    snapshot = UserSnapshot.from_user(user)
+    auth_cache.put(token, snapshot, payload.exp)
+    return snapshot
+
+
+def _active_user(snapshot: UserSnapshot) -> User:
+    if not snapshot.is_active:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Usuario inactivo")
+    return snapshot.to_user()
+
+
+def _require_role(user: User, roles: Set[UserRole]) -> User:
+    if user.role not in roles:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Permisos insuficientes")
     return user
 
 
+def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+    snapshot = auth_cache.get(token)
+    if snapshot is None:
+        payload = _token_payload(token)
+        snapshot = _cache_user(token, payload, db.query(User).filter(User.email == payload.sub).first())
+    return _active_user(snapshot)
+
+
 def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     if not current_user.is_active:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Usuario inactivo")
@@ -32,16 +67,55 @@ def get_current_active_user(current_user: User = Depends(get_current_user)) -> U
 
 
 def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
-    if current_user.role != UserRole.ADMIN:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Permisos insuficientes")
-    return current_user
+    return _require_role(current_user, {UserRole.ADMIN})
 
 
 def get_current_project_manager(current_user: User = Depends(get_current_user)) -> User:
-    if current_user.role not in {UserRole.ADMIN, UserRole.JEFE_PROYECTO}:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Permisos insuficientes")
-    return current_user
+    return _require_role(current_user, {UserRole.ADMIN, UserRole.JEFE_PROYECTO})
 
 
 def get_db_session() -> Generator[Session, None, None]:
     yield from get_db()
+
+
+async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    async for db in get_async_db():
+        yield db
+
+
+def get_read_sessionmaker(request: Request) -> sessionmaker:
+    return SessionLocal if reads_from_primary(request) else read_sessionmaker()
+
+
+def get_read_db_session(factory: sessionmaker = Depends(get_read_sessionmaker)) -> Generator[Session, None, None]:
+    db = factory()
+    try:
+        timed_checkout(db)
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    factory = AsyncSessionLocal if reads_from_primary(request) else async_read_sessionmaker()
+    async with factory() as db:
+        await timed_async_checkout(db)
+        yield db
+
+
+async def get_async_current_user(
+    db: AsyncSession = Depends(get_async_db_session), token: str = Depends(oauth2_scheme)
+) -> User:
+    snapshot = auth_cache.get(token)
+    if snapshot is None:
+        payload = _token_payload(token)
+        snapshot = _cache_user(token, payload, await db.scalar(select(User).where(User.email == payload.sub)))
+    return _active_user(snapshot)
+
+
+async def get_async_current_admin(current_user: User = Depends(get_async_current_user)) -> User:
+    return _require_role(current_user, {UserRole.ADMIN})
+
+
+async def get_async_current_project_manager(current_user: User = Depends(get_async_current_user)) -> User:
+    return _require_role(current_user, {UserRole.ADMIN, UserRole.JEFE_PROYECTO})
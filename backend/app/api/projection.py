@@ -0,0 +1,13 @@
+from typing import Any, Dict, Iterable, List, Sequence, Type
+
+from pydantic import BaseModel
+
+from app.db.base import Base
+
+
+def schema_columns(model: Type[Base], schema: Type[BaseModel]) -> List[Any]:
+    return [getattr(model, name) for name in schema.__fields__]
+
+
+def rows_to_dicts(rows: Iterable[Sequence[Any]], names: Sequence[str]) -> List[Dict[str, Any]]:
+    return [dict(zip(names, row)) for row in rows]
@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Iterator, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def _to_text(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _iter_partitions(statement: Select, session_factory: sessionmaker) -> Iterator[Sequence[Any]]:
+    db = session_factory()
+    try:
+        result = db.execute(statement.execution_options(yield_per=settings.export_batch_size))
+        for partition in result.partitions():
+            yield partition
+    finally:
+        db.close()
+
+
+def _ndjson_lines(statement: Select, columns: Sequence[str], session_factory: sessionmaker) -> Iterator[str]:
+    for partition in _iter_partitions(statement, session_factory):
+        yield "".join(
+            json.dumps(dict(zip(columns, map(_to_text, row))), ensure_ascii=False) + "\n"
+            for row in partition
+        )
+
+
+def _csv_lines(statement: Select, columns: Sequence[str], session_factory: sessionmaker) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for partition in _iter_partitions(statement, session_factory):
+        writer.writerows([_to_text(value) for value in row] for row in partition)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_response(
+    statement: Select,
+    columns: Sequence[str],
+    fmt: ExportFormat,
+    filename: str,
+    session_factory: sessionmaker = SessionLocal,
+) -> StreamingResponse:
+    if fmt == ExportFormat.CSV:
+        body = _csv_lines(statement, columns, session_factory)
+    else:
+        body = _ndjson_lines(statement, columns, session_factory)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt.value}"'},
+    )
@@ -0,0 +1,134 @@
+import argparse
+import logging
+
+from app import models  # noqa: F401
+from app.core.challenge_store import challenge_store
+from app.core.config import settings
+from app.db import migrations
+from app.db.session import SessionLocal, engine
+from app.services import search, sla, ticket_counters, ticket_rollups
+from app.services.outbox import OutboxWorker
+from app.services.sla import SlaScheduler
+
+logger = logging.getLogger(__name__)
+
+
+def rebuild_ticket_counters(_: argparse.Namespace) -> None:
+    db = SessionLocal()
+    try:
+        rows = ticket_counters.rebuild(db)
+        db.commit()
+        logger.info("Contadores de tickets recalculados: %s filas", rows)
+    finally:
+        db.close()
+
+
+def rebuild_ticket_rollups(_: argparse.Namespace) -> None:
+    db = SessionLocal()
+    try:
+        rows = ticket_rollups.rebuild(db)
+        db.commit()
+        logger.info("Agregados diarios de tickets recalculados: %s filas", rows)
+    finally:
+        db.close()
+
+
+def rebuild_search_index(_: argparse.Namespace) -> None:
+    db = SessionLocal()
+    try:
+        backend = search.get_backend(db)
+        backend.rebuild(db)
+        db.commit()
+        logger.info("Índice de búsqueda reconstruido (%s)", type(backend).__name__)
+    finally:
+        db.close()
+
+
+def migrate(args: argparse.Namespace) -> None:
+    with engine.connect() as conn:
+        current = migrations.current_version(conn)
+        todo = migrations.pending(conn, args.target)
+    if args.status:
+        logger.info("Versión del esquema: %s (última: %s)", current, migrations.latest_version())
+        for migration in todo:
+            logger.info("Pendiente %04d: %s", migration.version, migration.description)
+        return
+    applied = migrations.upgrade(engine, args.target)
+    logger.info("Migraciones aplicadas: %s", len(applied))
+
+
+def reap_two_factor_challenges(args: argparse.Namespace) -> None:
+    reaped = challenge_store.reap(args.batch_size)
+    logger.info("Códigos 2FA caducados eliminados: %s", reaped)
+
+
+def outbox_worker(args: argparse.Namespace) -> None:
+    worker = OutboxWorker()
+    if args.once:
+        logger.info("Eventos procesados: %s", worker.run_once())
+        return
+    worker.run_forever()
+
+
+def sla_scheduler(args: argparse.Namespace) -> None:
+    scheduler = SlaScheduler()
+    if args.once:
+        logger.info("Tickets con SLA incumplido: %s", scheduler.run_once())
+        return
+    scheduler.run_forever()
+
+
+def recompute_sla(args: argparse.Namespace) -> None:
+    db = SessionLocal()
+    try:
+        changed = sla.recompute(db, args.batch_size)
+        logger.info("Vencimientos de SLA recalculados: %s tickets", changed)
+    finally:
+        db.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Tareas de administración de Octopus Helpdesk")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = subparsers.add_parser("rebuild-ticket-counters", help="Recalcula los contadores de tickets por estado y proyecto")
+    rebuild.set_defaults(handler=rebuild_ticket_counters)
+
+    rollups = subparsers.add_parser("rebuild-ticket-rollups", help="Recalcula los agregados diarios de tickets creados y resueltos")
+    rollups.set_defaults(handler=rebuild_ticket_rollups)
+
+    reindex = subparsers.add_parser("rebuild-search-index", help="Reconstruye el índice de búsqueda de tickets y wikis")
+    reindex.set_defaults(handler=rebuild_search_index)
+
+    migrate_parser = subparsers.add_parser("migrate", help="Aplica las migraciones de esquema pendientes")
+    migrate_parser.add_argument("--target", type=int, help="Versión hasta la que migrar (por defecto, la última)")
+    migrate_parser.add_argument("--status", action="store_true", help="Muestra la versión actual y las migraciones pendientes")
+    migrate_parser.set_defaults(handler=migrate)
+
+    reap = subparsers.add_parser("reap-2fa-challenges", help="Elimina en lotes los códigos 2FA caducados")
+    reap.add_argument("--batch-size", type=int, default=settings.two_factor_reap_batch_size)
+    reap.set_defaults(handler=reap_two_factor_challenges)
+
+    worker = subparsers.add_parser("outbox-worker", help="Entrega las notificaciones y webhooks pendientes del outbox")
+    worker.add_argument("--once", action="store_true", help="Procesa un único lote y termina")
+    worker.set_defaults(handler=outbox_worker)
+
+    scheduler = subparsers.add_parser("sla-scheduler", help="Marca los tickets que incumplen su SLA y notifica los incumplimientos")
+    scheduler.add_argument("--once", action="store_true", help="Comprueba los vencimientos una vez y termina")
+    scheduler.set_defaults(handler=sla_scheduler)
+
+    recompute = subparsers.add_parser("recompute-sla", help="Recalcula los vencimientos de SLA de los tickets abiertos")
+    recompute.add_argument("--batch-size", type=int, default=settings.sla_scheduler_batch_size)
+    recompute.set_defaults(handler=recompute_sla)
+
+    return parser
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    args = build_parser().parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
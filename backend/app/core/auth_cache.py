@@ -0,0 +1,166 @@
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.models.user import User, UserRole
+
+logger = logging.getLogger(__name__)
+
+InvalidationCallback = Callable[[int], None]
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    id: int
+    email: str
+    full_name: str
+    role: UserRole
+    is_active: bool
+    two_factor_enabled: bool
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            role=user.role,
+            is_active=bool(user.is_active),
+            two_factor_enabled=bool(user.two_factor_enabled),
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+    def to_user(self) -> User:
+        return User(**asdict(self))
+
+
+class InvalidationChannel(ABC):
+    @abstractmethod
+    def publish(self, user_id: int) -> None:
+        ...
+
+    @abstractmethod
+    def subscribe(self, callback: InvalidationCallback) -> None:
+        ...
+
+
+class LocalInvalidationChannel(InvalidationChannel):
+    def __init__(self) -> None:
+        self._callbacks: List[InvalidationCallback] = []
+
+    def publish(self, user_id: int) -> None:
+        for callback in self._callbacks:
+            callback(user_id)
+
+    def subscribe(self, callback: InvalidationCallback) -> None:
+        self._callbacks.append(callback)
+
+
+class RedisInvalidationChannel(LocalInvalidationChannel):
+    def __init__(self, url: str, channel: str = "octopus:auth-invalidate") -> None:
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("La invalidación por Redis requiere el paquete 'redis'") from exc
+        super().__init__()
+        self._client = redis.Redis.from_url(url)
+        self._channel = channel
+        self._listener: Optional[threading.Thread] = None
+
+    def publish(self, user_id: int) -> None:
+        super().publish(user_id)
+        self._client.publish(self._channel, str(user_id))
+
+    def subscribe(self, callback: InvalidationCallback) -> None:
+        super().subscribe(callback)
+        if self._listener is None:
+            self._listener = threading.Thread(target=self._listen, name="auth-cache-invalidation", daemon=True)
+            self._listener.start()
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._channel)
+                for message in pubsub.listen():
+                    LocalInvalidationChannel.publish(self, int(message["data"]))
+            except Exception:  # noqa: BLE001
+                logger.exception("Canal de invalidación de Redis caído, reintentando")
+                time.sleep(1)
+
+
+class AuthCache:
+    def __init__(self, max_entries: int, ttl_seconds: float, channel: InvalidationChannel) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._channel = channel
+        self._entries: "OrderedDict[str, Tuple[float, UserSnapshot]]" = OrderedDict()
+        self._lock = threading.Lock()
+        channel.subscribe(self._evict_user)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, token: str) -> Optional[UserSnapshot]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            expires_at, snapshot = entry
+            if expires_at <= time.time():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return snapshot
+
+    def put(self, token: str, snapshot: UserSnapshot, token_expires_at: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        with self._lock:
+            self._entries[token] = (expires_at, snapshot)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        self._channel.publish(user_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _evict_user(self, user_id: int) -> None:
+        with self._lock:
+            stale = [token for token, (_, snapshot) in self._entries.items() if snapshot.id == user_id]
+            for token in stale:
+                del self._entries[token]
+
+
+def build_invalidation_channel() -> InvalidationChannel:
+    if settings.auth_cache_invalidation == "redis":
+        if not settings.redis_url:
+            raise RuntimeError("auth_cache_invalidation=redis requiere configurar redis_url")
+        return RedisInvalidationChannel(settings.redis_url)
+    return LocalInvalidationChannel()
+
+
+auth_cache = AuthCache(
+    max_entries=settings.auth_cache_max_entries,
+    ttl_seconds=settings.auth_cache_ttl_seconds,
+    channel=build_invalidation_channel(),
+)
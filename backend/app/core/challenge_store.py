@@ -0,0 +1,179 @@
+import json
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.two_factor import TwoFactorToken
+
+
+@dataclass(frozen=True)
+class Challenge:
+    token: str
+    user_id: int
+    code: str
+    expires_at: datetime
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at < datetime.utcnow()
+
+
+class ChallengeStore(ABC):
+    @abstractmethod
+    def create(self, challenge: Challenge) -> None:
+        ...
+
+    @abstractmethod
+    def get(self, token: str) -> Optional[Challenge]:
+        ...
+
+    @abstractmethod
+    def delete(self, token: str) -> None:
+        ...
+
+    def reap(self, batch_size: int) -> int:
+        return 0
+
+
+class MemoryChallengeStore(ChallengeStore):
+    def __init__(self) -> None:
+        self._challenges: Dict[str, Challenge] = {}
+        self._by_user: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def create(self, challenge: Challenge) -> None:
+        with self._lock:
+            previous = self._by_user.pop(challenge.user_id, None)
+            if previous is not None:
+                self._challenges.pop(previous, None)
+            self._challenges[challenge.token] = challenge
+            self._by_user[challenge.user_id] = challenge.token
+
+    def get(self, token: str) -> Optional[Challenge]:
+        with self._lock:
+            return self._challenges.get(token)
+
+    def delete(self, token: str) -> None:
+        with self._lock:
+            challenge = self._challenges.pop(token, None)
+            if challenge is not None and self._by_user.get(challenge.user_id) == token:
+                del self._by_user[challenge.user_id]
+
+    def reap(self, batch_size: int) -> int:
+        with self._lock:
+            expired = [token for token, challenge in self._challenges.items() if challenge.expired]
+        for token in expired:
+            self.delete(token)
+        return len(expired)
+
+
+class RedisChallengeStore(ChallengeStore):
+    def __init__(self, url: str, prefix: str = "octopus:2fa") -> None:
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("El almacén de 2FA en Redis requiere el paquete 'redis'") from exc
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+        self._prefix = prefix
+
+    def _token_key(self, token: str) -> str:
+        return f"{self._prefix}:token:{token}"
+
+    def _user_key(self, user_id: int) -> str:
+        return f"{self._prefix}:user:{user_id}"
+
+    def create(self, challenge: Challenge) -> None:
+        ttl = max(1, int((challenge.expires_at - datetime.utcnow()).total_seconds()))
+        payload = json.dumps(
+            {"user_id": challenge.user_id, "code": challenge.code, "expires_at": challenge.expires_at.isoformat()}
+        )
+        previous = self._client.getset(self._user_key(challenge.user_id), challenge.token)
+        pipe = self._client.pipeline()
+        if previous:
+            pipe.delete(self._token_key(previous))
+        pipe.expire(self._user_key(challenge.user_id), ttl)
+        pipe.setex(self._token_key(challenge.token), ttl, payload)
+        pipe.execute()
+
+    def get(self, token: str) -> Optional[Challenge]:
+        payload = self._client.get(self._token_key(token))
+        if payload is None:
+            return None
+        data = json.loads(payload)
+        return Challenge(
+            token=token,
+            user_id=data["user_id"],
+            code=data["code"],
+            expires_at=datetime.fromisoformat(data["expires_at"]),
+        )
+
+    def delete(self, token: str) -> None:
+        self._client.delete(self._token_key(token))
+
+
+class SqlChallengeStore(ChallengeStore):
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal) -> None:
+        self._session_factory = session_factory
+
+    def create(self, challenge: Challenge) -> None:
+        with self._session_factory() as db:
+            db.execute(delete(TwoFactorToken).where(TwoFactorToken.user_id == challenge.user_id))
+            db.add(
+                TwoFactorToken(
+                    user_id=challenge.user_id,
+                    token=challenge.token,
+                    code=challenge.code,
+                    expires_at=challenge.expires_at,
+                )
+            )
+            db.commit()
+
+    def get(self, token: str) -> Optional[Challenge]:
+        with self._session_factory() as db:
+            record = db.scalar(select(TwoFactorToken).where(TwoFactorToken.token == token))
+            if record is None:
+                return None
+            return Challenge(token=record.token, user_id=record.user_id, code=record.code, expires_at=record.expires_at)
+
+    def delete(self, token: str) -> None:
+        with self._session_factory() as db:
+            db.execute(delete(TwoFactorToken).where(TwoFactorToken.token == token))
+            db.commit()
+
+    def reap(self, batch_size: int) -> int:
+        total = 0
+        with self._session_factory() as db:
+            while True:
+                ids = db.scalars(
+                    select(TwoFactorToken.id)
+                    .where(TwoFactorToken.expires_at < datetime.utcnow())
+                    .order_by(TwoFactorToken.expires_at)
+                    .limit(batch_size)
+                ).all()
+                if not ids:
+                    return total
+                db.execute(delete(TwoFactorToken).where(TwoFactorToken.id.in_(ids)))
+                db.commit()
+                total += len(ids)
+                if len(ids) < batch_size:
+                    return total
+
+
+def build_challenge_store() -> ChallengeStore:
+    if settings.two_factor_store == "redis":
+        if not settings.redis_url:
+            raise RuntimeError("two_factor_store=redis requiere configurar redis_url")
+        return RedisChallengeStore(settings.redis_url)
+    if settings.two_factor_store == "memory":
+        return MemoryChallengeStore()
+    return SqlChallengeStore()
+
+
+challenge_store = build_challenge_store()
@@ -0,0 +1,200 @@
+import asyncio
+import itertools
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Set
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+from app.core.metrics import event_stream_resyncs_total, event_stream_subscribers
+
+logger = logging.getLogger(__name__)
+
+MessageCallback = Callable[[str], None]
+
+RESYNC = "resync"
+
+
+def sse_frame(event: str, data: str, event_id: Optional[int] = None) -> str:
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines.append(f"event: {event}")
+    lines.extend(f"data: {line}" for line in data.splitlines() or [""])
+    return "\n".join(lines) + "\n\n"
+
+
+RESYNC_FRAME = sse_frame(RESYNC, "{}")
+
+
+class EventChannel(ABC):
+    @abstractmethod
+    def publish(self, message: str) -> None:
+        ...
+
+    @abstractmethod
+    def subscribe(self, callback: MessageCallback) -> None:
+        ...
+
+
+class LocalEventChannel(EventChannel):
+    def __init__(self) -> None:
+        self._callbacks: List[MessageCallback] = []
+
+    def publish(self, message: str) -> None:
+        for callback in self._callbacks:
+            callback(message)
+
+    def subscribe(self, callback: MessageCallback) -> None:
+        self._callbacks.append(callback)
+
+
+class RedisEventChannel(LocalEventChannel):
+    def __init__(self, url: str, channel: str = "octopus:events") -> None:
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("El flujo de eventos en Redis requiere el paquete 'redis'") from exc
+        super().__init__()
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+        self._channel = channel
+        self._listener: Optional[threading.Thread] = None
+
+    def publish(self, message: str) -> None:
+        self._client.publish(self._channel, message)
+
+    def subscribe(self, callback: MessageCallback) -> None:
+        super().subscribe(callback)
+        if self._listener is None:
+            self._listener = threading.Thread(target=self._listen, name="event-broker", daemon=True)
+            self._listener.start()
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._channel)
+                for message in pubsub.listen():
+                    LocalEventChannel.publish(self, message["data"])
+            except Exception:  # noqa: BLE001
+                logger.exception("Canal de eventos de Redis caído, reintentando")
+                time.sleep(1)
+
+
+class Subscription:
+    def __init__(self, topic: str, filters: Dict[str, Set[str]], queue_size: int) -> None:
+        self.topic = topic
+        self.filters = {name: values for name, values in filters.items() if values}
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=queue_size)
+
+    def matches(self, keys: Dict[str, List[str]]) -> bool:
+        return all(values.intersection(keys.get(name, ())) for name, values in self.filters.items())
+
+    def offer(self, frame: str) -> None:
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_FRAME)
+            event_stream_resyncs_total.inc(topic=self.topic)
+
+
+class EventBroker:
+    def __init__(self, channel: EventChannel, queue_size: int, max_subscribers: int) -> None:
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._channel = channel
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._sequence = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        channel.subscribe(self._receive)
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    @property
+    def full(self) -> bool:
+        return self.subscriber_count >= self.max_subscribers
+
+    def publish(self, topic: str, event: str, data: Dict[str, Any], keys: Dict[str, Iterable[Any]]) -> None:
+        message = {
+            "topic": topic,
+            "event": event,
+            "keys": {name: sorted({str(value) for value in values if value is not None}) for name, values in keys.items()},
+            "data": jsonable_encoder(data),
+        }
+        self._channel.publish(json.dumps(message, ensure_ascii=False))
+
+    def subscribe(self, topic: str, **filters: Iterable[Any]) -> Subscription:
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(
+            topic,
+            {name: {str(value) for value in values if value is not None} for name, values in filters.items()},
+            self.queue_size,
+        )
+        self._subscribers.setdefault(topic, set()).add(subscription)
+        event_stream_subscribers.inc(topic=topic)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.topic)
+        if subscribers is not None and subscription in subscribers:
+            subscribers.discard(subscription)
+            event_stream_subscribers.dec(topic=subscription.topic)
+
+    async def stream(self, topic: str, resync: bool = False, **filters: Iterable[Any]) -> AsyncIterator[str]:
+        subscription = self.subscribe(topic, **filters)
+        try:
+            yield f"retry: {int(settings.event_stream_keepalive_seconds * 1000)}\n\n"
+            if resync:
+                yield RESYNC_FRAME
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscription.queue.get(), settings.event_stream_keepalive_seconds)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+        finally:
+            self.unsubscribe(subscription)
+
+    def _receive(self, message: str) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._dispatch(message)
+        else:
+            loop.call_soon_threadsafe(self._dispatch, message)
+
+    def _dispatch(self, message: str) -> None:
+        payload = json.loads(message)
+        subscribers = self._subscribers.get(payload["topic"])
+        if not subscribers:
+            return
+        frame = sse_frame(payload["event"], json.dumps(payload["data"], ensure_ascii=False), next(self._sequence))
+        keys = payload["keys"]
+        for subscription in list(subscribers):
+            if subscription.matches(keys):
+                subscription.offer(frame)
+
+
+def build_event_channel() -> EventChannel:
+    if settings.event_stream_backend == "redis":
+        if not settings.redis_url:
+            raise RuntimeError("event_stream_backend=redis requiere configurar redis_url")
+        return RedisEventChannel(settings.redis_url)
+    return LocalEventChannel()
+
+
+event_broker = EventBroker(
+    channel=build_event_channel(),
+    queue_size=settings.event_stream_queue_size,
+    max_subscribers=settings.event_stream_max_subscribers,
+)
@@ -0,0 +1,311 @@
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, MutableMapping, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+slow_query_logger = logging.getLogger("app.slow_query")
+
+LabelValues = Tuple[str, ...]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}", *self.samples()]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_number(value)}" for key, value in values]
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._callbacks: Dict[LabelValues, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, callback: Callable[[], float], **labels: str) -> None:
+        with self._lock:
+            self._callbacks[self._key(labels)] = callback
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+            callbacks = list(self._callbacks.items())
+        for key, callback in callbacks:
+            values[key] = callback()
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_number(value)}" for key, value in values.items()]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._series.setdefault(key, ([0] * len(self.buckets), [0.0]))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            total[0] += value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            series = [(key, list(counts), total[0]) for key, (counts, total) in self._series.items()]
+        lines = []
+        for key, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = f'le="{_format_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_number(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests_total = registry.register(
+    Counter("http_requests_total", "Peticiones HTTP atendidas", ("method", "route", "status"))
+)
+http_request_duration = registry.register(
+    Histogram("http_request_duration_seconds", "Latencia de las peticiones HTTP", ("method", "route"))
+)
+http_request_db_queries = registry.register(
+    Histogram("http_request_db_queries", "Sentencias SQL ejecutadas por petición", ("method", "route"), QUERY_COUNT_BUCKETS)
+)
+http_request_db_duration = registry.register(
+    Histogram("http_request_db_duration_seconds", "Tiempo total en SQL por petición", ("method", "route"))
+)
+db_query_duration = registry.register(
+    Histogram("db_query_duration_seconds", "Duración de cada sentencia SQL", ("engine",))
+)
+db_slow_queries_total = registry.register(
+    Counter("db_slow_queries_total", "Sentencias SQL por encima del umbral de consulta lenta", ("engine", "route"))
+)
+db_pool_checkout_wait = registry.register(
+    Histogram("db_pool_checkout_wait_seconds", "Espera para obtener una conexión del pool", ("engine",))
+)
+db_pool_in_use = registry.register(
+    Gauge("db_pool_connections_in_use", "Conexiones del pool prestadas en este momento", ("engine",))
+)
+db_pool_size = registry.register(Gauge("db_pool_size", "Tamaño configurado del pool de conexiones", ("engine",)))
+event_stream_subscribers = registry.register(
+    Gauge("event_stream_subscribers", "Clientes conectados a los flujos de eventos", ("topic",))
+)
+event_stream_resyncs_total = registry.register(
+    Counter("event_stream_resyncs_total", "Clientes lentos a los que se pidió resincronizar", ("topic",))
+)
+
+
+@dataclass
+class RequestStats:
+    scope: MutableMapping[str, Any]
+    queries: int = 0
+    db_seconds: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @property
+    def route(self) -> str:
+        return route_label(self.scope)
+
+
+instrumented_engines: Dict[Engine, str] = {}
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+def route_label(scope: MutableMapping[str, Any]) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def _query_started(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _query_finished(engine_name: str) -> Callable[..., None]:
+    def listener(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        elapsed = time.perf_counter() - conn.info["query_started_at"].pop()
+        db_query_duration.observe(elapsed, engine=engine_name)
+        stats = current_request.get()
+        if stats is not None:
+            with stats.lock:
+                stats.queries += 1
+                stats.db_seconds += elapsed
+        threshold = settings.slow_query_threshold_ms
+        if threshold and elapsed * 1000 >= threshold:
+            route = stats.route if stats is not None else "-"
+            db_slow_queries_total.inc(engine=engine_name, route=route)
+            slow_query_logger.warning("%.1f ms [%s] %s", elapsed * 1000, route, " ".join(statement.split()))
+
+    return listener
+
+
+def _query_failed(context: Any) -> None:
+    if context.connection is not None:
+        started = context.connection.info.get("query_started_at")
+        if started:
+            started.pop()
+
+
+def _instrument_pool(engine: Engine, engine_name: str) -> None:
+    event.listen(engine.pool, "checkout", lambda *_: db_pool_in_use.inc(engine=engine_name))
+    event.listen(engine.pool, "checkin", lambda *_: db_pool_in_use.dec(engine=engine_name))
+    db_pool_in_use.set(0, engine=engine_name)
+    if hasattr(engine.pool, "size"):
+        db_pool_size.set_function(lambda: engine.pool.size(), engine=engine_name)
+    instrumented_engines[engine] = engine_name
+
+
+def _observe_checkout(bind: Engine, started: float) -> None:
+    db_pool_checkout_wait.observe(time.perf_counter() - started, engine=instrumented_engines[bind])
+
+
+def timed_checkout(db: Session) -> None:
+    if db.get_bind() in instrumented_engines:
+        started = time.perf_counter()
+        db.connection()
+        _observe_checkout(db.get_bind(), started)
+
+
+async def timed_async_checkout(db: AsyncSession) -> None:
+    if db.get_bind() in instrumented_engines:
+        started = time.perf_counter()
+        await db.connection()
+        _observe_checkout(db.get_bind(), started)
+
+
+def instrument_engine(engine: Engine, engine_name: str) -> None:
+    event.listen(engine, "before_cursor_execute", _query_started)
+    event.listen(engine, "after_cursor_execute", _query_finished(engine_name))
+    event.listen(engine, "handle_error", _query_failed)
+    _instrument_pool(engine, engine_name)
+
+
+class MetricsMiddleware:
+    def __init__(self, app: Callable) -> None:
+        self.app = app
+
+    async def __call__(self, scope: MutableMapping[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message: MutableMapping[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_request.reset(token)
+            labels = {"method": scope["method"], "route": stats.route}
+            http_requests_total.inc(status=str(status_code), **labels)
+            http_request_duration.observe(elapsed, **labels)
+            http_request_db_queries.observe(stats.queries, **labels)
+            http_request_db_duration.observe(stats.db_seconds, **labels)
+
+
+def render_metrics() -> str:
+    return registry.render()
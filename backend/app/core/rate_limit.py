@@ -0,0 +1,167 @@
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from fastapi import Request
+
+from app.core.config import settings
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+def parse_limit(value: str) -> Optional[Tuple[int, int]]:
+    if not value or value.strip() == "0":
+        return None
+    amount, _, period = value.partition("/")
+    try:
+        return int(amount), PERIODS[period.strip() or "minute"]
+    except (KeyError, ValueError) as exc:
+        raise ValueError(f"Límite inválido: {value!r} (formato N/second|minute|hour|day)") from exc
+
+
+Bucket = Tuple[str, int, int]
+
+
+class RateLimitBackend(ABC):
+    @abstractmethod
+    def hit(self, buckets: Sequence[Bucket]) -> float:
+        ...
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    def __init__(self, max_entries: int = 100000) -> None:
+        self.max_entries = max_entries
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, buckets: Sequence[Bucket]) -> float:
+        now = time.monotonic()
+        with self._lock:
+            refilled = []
+            retry_after = 0.0
+            for key, capacity, period in buckets:
+                rate = capacity / period
+                tokens, updated_at = self._buckets.get(key, (capacity, now))
+                tokens = min(capacity, tokens + (now - updated_at) * rate)
+                if tokens < 1:
+                    retry_after = max(retry_after, (1 - tokens) / rate)
+                refilled.append((key, tokens))
+            for key, tokens in refilled:
+                self._buckets[key] = (tokens - 1 if retry_after == 0 else tokens, now)
+                self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    SCRIPT = """
+    local now = tonumber(ARGV[1])
+    local retry_after = 0
+    local refilled = {}
+    for i, key in ipairs(KEYS) do
+        local capacity = tonumber(ARGV[i * 2])
+        local rate = tonumber(ARGV[i * 2 + 1])
+        local state = redis.call('HMGET', key, 'tokens', 'ts')
+        local tokens = tonumber(state[1]) or capacity
+        local updated_at = tonumber(state[2]) or now
+        tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+        if tokens < 1 then
+            retry_after = math.max(retry_after, (1 - tokens) / rate)
+        end
+        refilled[i] = tokens
+    end
+    for i, key in ipairs(KEYS) do
+        local capacity = tonumber(ARGV[i * 2])
+        local rate = tonumber(ARGV[i * 2 + 1])
+        local tokens = refilled[i]
+        if retry_after == 0 then
+            tokens = tokens - 1
+        end
+        redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', tostring(now))
+        redis.call('EXPIRE', key, math.ceil(capacity / rate) + 1)
+    end
+    return tostring(retry_after)
+    """
+
+    def __init__(self, url: str, prefix: str = "octopus:ratelimit") -> None:
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("El limitador en Redis requiere el paquete 'redis'") from exc
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+        self._prefix = prefix
+
+    def hit(self, buckets: Sequence[Bucket]) -> float:
+        args: List[float] = [time.time()]
+        for _, capacity, period in buckets:
+            args.extend([capacity, capacity / period])
+        result = self._script(keys=[f"{self._prefix}:{key}" for key, _, _ in buckets], args=args)
+        return float(result)
+
+
+class RateLimiter:
+    def __init__(self, backend: RateLimitBackend, limits: Dict[str, str], enabled: bool = True) -> None:
+        self.backend = backend
+        self.enabled = enabled
+        self.limits = {name: parse_limit(value) for name, value in limits.items()}
+
+    def check(self, action: str, **keys: Optional[str]) -> None:
+        if not self.enabled:
+            return
+        buckets = []
+        for key_name, key_value in keys.items():
+            limit = self.limits.get(f"{action}_per_{key_name}")
+            if limit is None or not key_value:
+                continue
+            capacity, period = limit
+            buckets.append((f"{action}:{key_name}:{key_value.lower()}", capacity, period))
+        if not buckets:
+            return
+        retry_after = self.backend.hit(buckets)
+        if retry_after > 0:
+            raise RateLimitExceeded(retry_after)
+
+
+def client_ip(request: Request) -> str:
+    if settings.rate_limit_trust_forwarded:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "-"
+
+
+def build_rate_limit_backend() -> RateLimitBackend:
+    if settings.rate_limit_backend == "redis":
+        if not settings.redis_url:
+            raise RuntimeError("rate_limit_backend=redis requiere configurar redis_url")
+        return RedisRateLimitBackend(settings.redis_url)
+    return MemoryRateLimitBackend()
+
+
+rate_limiter = RateLimiter(
+    backend=build_rate_limit_backend(),
+    limits={
+        "login_per_ip": settings.rate_limit_login_per_ip,
+        "login_per_email": settings.rate_limit_login_per_email,
+        "verify_per_ip": settings.rate_limit_verify_per_ip,
+        "verify_per_token": settings.rate_limit_verify_per_token,
+        "register_per_ip": settings.rate_limit_register_per_ip,
+        "register_per_email": settings.rate_limit_register_per_email,
+    },
+    enabled=settings.rate_limit_enabled,
+)
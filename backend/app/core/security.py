@@ -1,14 +1,81 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from functools import lru_cache
+from typing import Any, Callable, Optional, TypeVar
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app.schemas.auth import TokenPayload
+
 from .config import settings
 
 
 ALGORITHM = "HS256"
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusyError(RuntimeError):
+    pass
+
+
+@lru_cache
+def _crypt_context(rounds: int) -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+pwd_context = _crypt_context(settings.bcrypt_rounds)
+
+
+def _hash_password(password: str, rounds: int) -> str:
+    return _crypt_context(rounds).hash(password)
+
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, queue_size: int) -> None:
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(max(workers + queue_size, 1))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def run(self, func: Callable[..., T], *args: Any) -> T:
+        if self.workers <= 0:
+            return func(*args)
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusyError("Demasiadas operaciones de contraseña en curso")
+        try:
+            return self._get_executor().submit(func, *args).result()
+        except BrokenProcessPool:
+            self.shutdown()
+            raise
+        finally:
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher(settings.password_hash_workers, settings.password_hash_queue_size)
 
 
 def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
@@ -19,17 +86,26 @@ def create_access_token(subject: str, expires_delta: Optional[timedelta] = None)
     return jwt.encode(to_encode, settings.secret_key, algorithm=ALGORITHM)
 
 
-def verify_token(token: str) -> str | None:
+def decode_access_token(token: str) -> TokenPayload | None:
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[ALGORITHM])
-        return payload.get("sub")
     except JWTError:
         return None
+    return TokenPayload(**payload)
+
+
+def verify_token(token: str) -> str | None:
+    payload = decode_access_token(token)
+    return payload.sub if payload else None
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.run(_verify_password, plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_hasher.run(_hash_password, password, settings.bcrypt_rounds)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    return pwd_context.needs_update(hashed_password)
@@ -0,0 +1,108 @@
+import importlib
+import logging
+import pkgutil
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, inspect, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.migrations import versions
+
+logger = logging.getLogger(__name__)
+
+LOCK_NAME = "octopus_schema_migrations"
+LOCK_TIMEOUT_SECONDS = 600
+
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class MigrationError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+def discover() -> List[Migration]:
+    found = []
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        module = importlib.import_module(f"{versions.__name__}.{module_info.name}")
+        found.append(Migration(module.version, module.description, module.upgrade))
+    found.sort(key=lambda migration: migration.version)
+    numbers = [migration.version for migration in found]
+    if len(numbers) != len(set(numbers)):
+        raise MigrationError(f"Versiones de migración duplicadas: {numbers}")
+    return found
+
+
+def latest_version() -> int:
+    migrations = discover()
+    return migrations[-1].version if migrations else 0
+
+
+def current_version(conn: Connection) -> int:
+    if not inspect(conn).has_table(schema_version.name):
+        return 0
+    return conn.scalar(select(func.max(schema_version.c.version))) or 0
+
+
+def pending(conn: Connection, target: Optional[int] = None) -> List[Migration]:
+    current = current_version(conn)
+    return [
+        migration
+        for migration in discover()
+        if migration.version > current and (target is None or migration.version <= target)
+    ]
+
+
+def is_current(engine: Engine) -> bool:
+    with engine.connect() as conn:
+        return current_version(conn) >= latest_version()
+
+
+@contextmanager
+def _migration_lock(conn: Connection) -> Iterator[None]:
+    if conn.dialect.name != "mysql":
+        yield
+        return
+    acquired = conn.scalar(text("SELECT GET_LOCK(:name, :timeout)"), {"name": LOCK_NAME, "timeout": LOCK_TIMEOUT_SECONDS})
+    if acquired != 1:
+        raise MigrationError("No se pudo obtener el bloqueo de migraciones")
+    try:
+        yield
+    finally:
+        conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": LOCK_NAME})
+
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> List[Migration]:
+    applied = []
+    with engine.connect() as conn:
+        with _migration_lock(conn):
+            schema_version.create(conn, checkfirst=True)
+            conn.commit()
+            for migration in pending(conn, target):
+                logger.info("Aplicando migración %04d: %s", migration.version, migration.description)
+                migration.upgrade(conn)
+                conn.execute(
+                    insert(schema_version).values(
+                        version=migration.version,
+                        description=migration.description,
+                        applied_at=datetime.utcnow(),
+                    )
+                )
+                conn.commit()
+                applied.append(migration)
+    return applied
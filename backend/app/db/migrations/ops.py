@@ -0,0 +1,82 @@
+from typing import Sequence
+
+from sqlalchemy import Column, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn
+
+
+def index_exists(conn: Connection, table: str, name: str) -> bool:
+    return any(index["name"] == name for index in inspect(conn).get_indexes(table))
+
+
+def column_exists(conn: Connection, table: str, name: str) -> bool:
+    return any(column["name"] == name for column in inspect(conn).get_columns(table))
+
+
+def add_column(conn: Connection, table: str, column: Column) -> bool:
+    if column_exists(conn, table, column.name):
+        return False
+
+    quote = conn.dialect.identifier_preparer.quote
+    ddl = f"ALTER TABLE {quote(table)} ADD COLUMN {CreateColumn(column).compile(dialect=conn.dialect)}"
+    if conn.dialect.name == "mysql":
+        ddl += ", ALGORITHM=INPLACE, LOCK=NONE"
+    conn.execute(text(ddl))
+    return True
+
+
+def create_index(
+    conn: Connection,
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    unique: bool = False,
+    fulltext: bool = False,
+) -> bool:
+    mysql = conn.dialect.name == "mysql"
+    if fulltext and not mysql:
+        return False
+    if index_exists(conn, table, name):
+        return False
+
+    quote = conn.dialect.identifier_preparer.quote
+    kind = "FULLTEXT INDEX" if fulltext else "UNIQUE INDEX" if unique else "INDEX"
+    ddl = f"CREATE {kind} {quote(name)} ON {quote(table)} ({', '.join(quote(column) for column in columns)})"
+    if mysql:
+        ddl += " ALGORITHM=INPLACE LOCK=SHARED" if fulltext else " ALGORITHM=INPLACE LOCK=NONE"
+    conn.execute(text(ddl))
+    return True
+
+
+def drop_index(conn: Connection, name: str, table: str) -> bool:
+    if not index_exists(conn, table, name):
+        return False
+
+    quote = conn.dialect.identifier_preparer.quote
+    if conn.dialect.name == "mysql":
+        ddl = f"DROP INDEX {quote(name)} ON {quote(table)} ALGORITHM=INPLACE LOCK=NONE"
+    else:
+        ddl = f"DROP INDEX {quote(name)}"
+    conn.execute(text(ddl))
+    return True
+
+
+def drop_foreign_key(conn: Connection, table: str, columns: Sequence[str]) -> bool:
+    if conn.dialect.name == "sqlite":
+        return False
+    names = [
+        foreign_key["name"]
+        for foreign_key in inspect(conn).get_foreign_keys(table)
+        if foreign_key["constrained_columns"] == list(columns) and foreign_key["name"]
+    ]
+    if not names:
+        return False
+
+    quote = conn.dialect.identifier_preparer.quote
+    for name in names:
+        if conn.dialect.name == "mysql":
+            ddl = f"ALTER TABLE {quote(table)} DROP FOREIGN KEY {quote(name)}, ALGORITHM=INPLACE, LOCK=NONE"
+        else:
+            ddl = f"ALTER TABLE {quote(table)} DROP CONSTRAINT {quote(name)}"
+        conn.execute(text(ddl))
+    return True
@@ -0,0 +1,142 @@
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    MetaData,
+    String,
+    Table,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects import mysql
+from sqlalchemy.engine import Connection
+
+version = 1
+description = "Tablas iniciales"
+
+metadata = MetaData()
+
+TICKET_STATUS = Enum("PENDIENTE", "EN_PROGRESO", "EN_REVISION", "COMPLETADO", "CERRADO", name="ticketstatus")
+
+Table(
+    "users",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("email", String(255), unique=True, index=True, nullable=False),
+    Column("full_name", String(255), nullable=False),
+    Column("hashed_password", String(255), nullable=False),
+    Column("role", Enum("ADMIN", "JEFE_PROYECTO", "USUARIO", "VISUALIZADOR", name="userrole"), nullable=False),
+    Column("is_active", Boolean),
+    Column("two_factor_enabled", Boolean),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "projects",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(255), unique=True, nullable=False),
+    Column("description", Text),
+    Column("project_manager_id", Integer, ForeignKey("users.id")),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False, index=True),
+)
+
+Table(
+    "two_factor_tokens",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False, index=True),
+    Column("token", String(64), unique=True, index=True, nullable=False),
+    Column("code", String(6), nullable=False),
+    Column("expires_at", DateTime, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+)
+
+Table(
+    "inventory_items",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(255), nullable=False),
+    Column("type", Enum("TELEFONO", "ORDENADOR", "TABLET", "MONITOR", "OTRO", name="inventorytype"), nullable=False),
+    Column("serial_number", String(255), unique=True, nullable=False),
+    Column("assigned_user_id", Integer, ForeignKey("users.id")),
+    Column("assigned_project_id", Integer, ForeignKey("projects.id")),
+    Column("status", Enum("DISPONIBLE", "ASIGNADO", "MANTENIMIENTO", name="inventorystatus"), nullable=False),
+    Column("purchase_date", Date),
+    Column("notes", Text),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False, index=True),
+)
+
+Table(
+    "ticket_status_counts",
+    metadata,
+    Column("project_id", Integer, ForeignKey("projects.id"), primary_key=True),
+    Column("status", TICKET_STATUS, primary_key=True),
+    Column("count", Integer, nullable=False),
+)
+
+Table(
+    "tickets",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("project_id", Integer, ForeignKey("projects.id"), nullable=False),
+    Column("reporter_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("assignee_id", Integer, ForeignKey("users.id")),
+    Column("title", String(255), nullable=False),
+    Column("description", Text),
+    Column("priority", Enum("BAJA", "MEDIA", "ALTA", "URGENTE", name="ticketpriority"), nullable=False),
+    Column("status", TICKET_STATUS, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False, index=True),
+    Index("ix_tickets_project_status_created_id", "project_id", "status", "created_at", "id"),
+    Index("ix_tickets_created_id", "created_at", "id"),
+    Index("ix_tickets_status_created_id", "status", "created_at", "id"),
+    Index("ix_tickets_priority_created_id", "priority", "created_at", "id"),
+    Index("ix_tickets_assignee_created_id", "assignee_id", "created_at", "id"),
+    Index("ix_tickets_reporter_created_id", "reporter_id", "created_at", "id"),
+    Index("ix_tickets_project_priority", "project_id", "priority"),
+    Index("ix_tickets_project_assignee", "project_id", "assignee_id"),
+    Index("ft_tickets_title_description", "title", "description", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+)
+
+Table(
+    "wikis",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("project_id", Integer, ForeignKey("projects.id"), nullable=False),
+    Column("author_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("title", String(255), nullable=False),
+    Column("content", Text, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False, index=True),
+    Index("ft_wikis_title_content", "title", "content", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+)
+
+Table(
+    "wiki_revisions",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("wiki_id", Integer, ForeignKey("wikis.id"), nullable=False),
+    Column("revision", Integer, nullable=False),
+    Column("author_id", Integer, ForeignKey("users.id")),
+    Column("title", String(255), nullable=False),
+    Column("is_snapshot", Boolean, nullable=False),
+    Column("content_size", Integer, nullable=False),
+    Column("payload", LargeBinary().with_variant(mysql.LONGBLOB(), "mysql"), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    UniqueConstraint("wiki_id", "revision", name="uq_wiki_revisions_wiki_revision"),
+    Index("ix_wiki_revisions_wiki_snapshot_revision", "wiki_id", "is_snapshot", "revision"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    metadata.create_all(bind=conn)
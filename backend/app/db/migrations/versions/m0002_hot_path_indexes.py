@@ -0,0 +1,34 @@
+from sqlalchemy.engine import Connection
+
+from app.db.migrations.ops import create_index
+
+version = 2
+description = "Índices para listados, filtros, facetas y búsqueda"
+
+INDEXES = [
+    ("ix_tickets_project_status_created_id", "tickets", ["project_id", "status", "created_at", "id"]),
+    ("ix_tickets_created_id", "tickets", ["created_at", "id"]),
+    ("ix_tickets_status_created_id", "tickets", ["status", "created_at", "id"]),
+    ("ix_tickets_priority_created_id", "tickets", ["priority", "created_at", "id"]),
+    ("ix_tickets_assignee_created_id", "tickets", ["assignee_id", "created_at", "id"]),
+    ("ix_tickets_reporter_created_id", "tickets", ["reporter_id", "created_at", "id"]),
+    ("ix_tickets_project_priority", "tickets", ["project_id", "priority"]),
+    ("ix_tickets_project_assignee", "tickets", ["project_id", "assignee_id"]),
+    ("ix_tickets_updated_at", "tickets", ["updated_at"]),
+    ("ix_projects_updated_at", "projects", ["updated_at"]),
+    ("ix_inventory_items_updated_at", "inventory_items", ["updated_at"]),
+    ("ix_wikis_updated_at", "wikis", ["updated_at"]),
+    ("ix_wiki_revisions_wiki_snapshot_revision", "wiki_revisions", ["wiki_id", "is_snapshot", "revision"]),
+]
+
+FULLTEXT_INDEXES = [
+    ("ft_tickets_title_description", "tickets", ["title", "description"]),
+    ("ft_wikis_title_content", "wikis", ["title", "content"]),
+]
+
+
+def upgrade(conn: Connection) -> None:
+    for name, table, columns in INDEXES:
+        create_index(conn, name, table, columns)
+    for name, table, columns in FULLTEXT_INDEXES:
+        create_index(conn, name, table, columns, fulltext=True)
@@ -0,0 +1,10 @@
+from sqlalchemy.engine import Connection
+
+from app.db.migrations.ops import create_index
+
+version = 3
+description = "Índice de caducidad de los códigos 2FA"
+
+
+def upgrade(conn: Connection) -> None:
+    create_index(conn, "ix_two_factor_tokens_expires_at", "two_factor_tokens", ["expires_at"])
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, DateTime, Enum, Index, Integer, MetaData, String, Table, Text
+from sqlalchemy.engine import Connection
+
+version = 4
+description = "Tabla outbox de notificaciones y webhooks"
+
+outbox_events = Table(
+    "outbox_events",
+    MetaData(),
+    Column("id", Integer, primary_key=True, index=True),
+    Column("event_type", String(64), nullable=False),
+    Column("channel", Enum("EMAIL", "WEBHOOK", name="outboxchannel"), nullable=False),
+    Column("target", String(512)),
+    Column("payload", Text, nullable=False),
+    Column("status", Enum("PENDIENTE", "PROCESANDO", "ENVIADO", "FALLIDO", name="outboxstatus"), nullable=False),
+    Column("attempts", Integer, nullable=False),
+    Column("next_attempt_at", DateTime, nullable=False),
+    Column("locked_until", DateTime),
+    Column("last_error", Text),
+    Column("created_at", DateTime, nullable=False),
+    Column("delivered_at", DateTime),
+    Index("ix_outbox_events_status_next_attempt", "status", "next_attempt_at"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    outbox_events.create(bind=conn, checkfirst=True)
@@ -0,0 +1,36 @@
+from sqlalchemy import Boolean, Column, DateTime, Enum, Index, Integer, MetaData, Table, false, insert, literal, select
+from sqlalchemy.engine import Connection
+
+version = 5
+description = "Registro de cambios para sincronización incremental"
+
+metadata = MetaData()
+
+change_log = Table(
+    "change_log",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("entity", Enum("TICKET", "PROYECTO", "WIKI", "INVENTARIO", name="changeentity"), nullable=False),
+    Column("entity_id", Integer, nullable=False),
+    Column("deleted", Boolean, nullable=False),
+    Column("created_at", DateTime, nullable=False, index=True),
+    Index("ix_change_log_entity_entity_id", "entity", "entity_id"),
+)
+
+TRACKED = [
+    (entity, Table(name, metadata, Column("id", Integer, primary_key=True), Column("updated_at", DateTime)))
+    for entity, name in [("PROYECTO", "projects"), ("TICKET", "tickets"), ("WIKI", "wikis"), ("INVENTARIO", "inventory_items")]
+]
+
+
+def upgrade(conn: Connection) -> None:
+    change_log.create(bind=conn, checkfirst=True)
+    if conn.execute(select(change_log.c.id).limit(1)).first() is not None:
+        return
+    for entity, table in TRACKED:
+        rows = select(
+            literal(entity, change_log.c.entity.type), table.c.id, false(), table.c.updated_at
+        ).order_by(table.c.updated_at, table.c.id)
+        conn.execute(
+            insert(change_log).from_select(["entity", "entity_id", "deleted", "created_at"], rows)
+        )
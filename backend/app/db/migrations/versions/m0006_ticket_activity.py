@@ -0,0 +1,27 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, MetaData, String, Table, Text
+from sqlalchemy.engine import Connection
+
+version = 6
+description = "Historial de actividad de los tickets"
+
+metadata = MetaData()
+
+Table("tickets", metadata, Column("id", Integer, primary_key=True))
+Table("users", metadata, Column("id", Integer, primary_key=True))
+
+ticket_activity = Table(
+    "ticket_activity",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("ticket_id", Integer, ForeignKey("tickets.id"), nullable=False),
+    Column("actor_id", Integer, ForeignKey("users.id")),
+    Column("field", String(64), nullable=False),
+    Column("old_value", Text),
+    Column("new_value", Text),
+    Column("created_at", DateTime, nullable=False),
+    Index("ix_ticket_activity_ticket_created", "ticket_id", "created_at"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    ticket_activity.create(bind=conn, checkfirst=True)
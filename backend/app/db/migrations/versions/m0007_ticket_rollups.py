@@ -0,0 +1,97 @@
+from collections import Counter, defaultdict
+from typing import DefaultDict, Tuple
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    Table,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.engine import Connection
+
+from app.db.migrations.ops import add_column
+
+version = 7
+description = "Fecha de resolución y agregados diarios de tickets"
+
+BATCH_SIZE = 5000
+
+RESOLVED_STATUSES = ["COMPLETADO", "CERRADO"]
+
+metadata = MetaData()
+
+Table("projects", metadata, Column("id", Integer, primary_key=True))
+
+TICKET_PRIORITY = Enum("BAJA", "MEDIA", "ALTA", "URGENTE", name="ticketpriority")
+
+tickets = Table(
+    "tickets",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("project_id", Integer),
+    Column("priority", TICKET_PRIORITY),
+    Column("status", Enum("PENDIENTE", "EN_PROGRESO", "EN_REVISION", "COMPLETADO", "CERRADO", name="ticketstatus")),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("resolved_at", DateTime),
+)
+
+ticket_daily_stats = Table(
+    "ticket_daily_stats",
+    metadata,
+    Column("day", Date, primary_key=True),
+    Column("project_id", Integer, ForeignKey("projects.id"), primary_key=True),
+    Column("priority", TICKET_PRIORITY, primary_key=True),
+    Column("created", Integer, nullable=False),
+    Column("resolved", Integer, nullable=False),
+    Column("resolution_seconds", BigInteger, nullable=False),
+    Index("ix_ticket_daily_stats_project_day", "project_id", "day"),
+)
+
+
+def _build_rollups(conn: Connection) -> None:
+    if conn.execute(select(ticket_daily_stats.c.day).limit(1)).first() is not None:
+        return
+    deltas: DefaultDict[Tuple, Counter] = defaultdict(Counter)
+    rows = conn.execution_options(yield_per=BATCH_SIZE).execute(
+        select(tickets.c.project_id, tickets.c.priority, tickets.c.created_at, tickets.c.resolved_at)
+    )
+    for project_id, priority, created_at, resolved_at in rows:
+        deltas[(created_at.date(), project_id, priority)]["created"] += 1
+        if resolved_at is not None:
+            bucket = deltas[(resolved_at.date(), project_id, priority)]
+            bucket["resolved"] += 1
+            bucket["resolution_seconds"] += int((resolved_at - created_at).total_seconds())
+    records = [
+        {
+            "day": day,
+            "project_id": project_id,
+            "priority": priority,
+            "created": amounts["created"],
+            "resolved": amounts["resolved"],
+            "resolution_seconds": amounts["resolution_seconds"],
+        }
+        for (day, project_id, priority), amounts in deltas.items()
+    ]
+    for start in range(0, len(records), BATCH_SIZE):
+        conn.execute(insert(ticket_daily_stats), records[start:start + BATCH_SIZE])
+
+
+def upgrade(conn: Connection) -> None:
+    add_column(conn, "tickets", Column("resolved_at", DateTime, nullable=True))
+    conn.execute(
+        update(tickets)
+        .where(tickets.c.status.in_(RESOLVED_STATUSES), tickets.c.resolved_at.is_(None))
+        .values(resolved_at=tickets.c.updated_at)
+    )
+    ticket_daily_stats.create(bind=conn, checkfirst=True)
+    _build_rollups(conn)
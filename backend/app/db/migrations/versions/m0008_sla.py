@@ -0,0 +1,31 @@
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, MetaData, Table, UniqueConstraint
+from sqlalchemy.engine import Connection
+
+from app.db.migrations.ops import add_column, create_index
+
+version = 8
+description = "Políticas de SLA y vencimientos de tickets"
+
+metadata = MetaData()
+
+Table("projects", metadata, Column("id", Integer, primary_key=True))
+
+sla_policies = Table(
+    "sla_policies",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("project_id", Integer, ForeignKey("projects.id")),
+    Column("priority", Enum("BAJA", "MEDIA", "ALTA", "URGENTE", name="ticketpriority"), nullable=False),
+    Column("response_minutes", Integer),
+    Column("resolution_minutes", Integer, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+    UniqueConstraint("project_id", "priority", name="uq_sla_policies_project_priority"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    sla_policies.create(bind=conn, checkfirst=True)
+    add_column(conn, "tickets", Column("sla_due_at", DateTime, nullable=True))
+    add_column(conn, "tickets", Column("sla_breached_at", DateTime, nullable=True))
+    create_index(conn, "ix_tickets_sla_due_breached", "tickets", ["sla_due_at", "sla_breached_at"])
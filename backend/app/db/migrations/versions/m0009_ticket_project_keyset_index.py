@@ -0,0 +1,10 @@
+from sqlalchemy.engine import Connection
+
+from app.db.migrations.ops import create_index
+
+version = 9
+description = "Índice de paginación de tickets por proyecto"
+
+
+def upgrade(conn: Connection) -> None:
+    create_index(conn, "ix_tickets_project_created_id", "tickets", ["project_id", "created_at", "id"])
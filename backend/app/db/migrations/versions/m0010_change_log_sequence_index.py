@@ -0,0 +1,10 @@
+from sqlalchemy.engine import Connection
+
+from app.db.migrations.ops import create_index
+
+version = 10
+description = "Índice de secuencia del registro de cambios por entidad"
+
+
+def upgrade(conn: Connection) -> None:
+    create_index(conn, "ix_change_log_entity_seq", "change_log", ["entity", "id"])
@@ -0,0 +1,12 @@
+from sqlalchemy.engine import Connection
+
+from app.db.migrations.ops import create_index, drop_index
+
+version = 12
+description = "Índices de SLA encabezados por sla_breached_at y por sla_due_at"
+
+
+def upgrade(conn: Connection) -> None:
+    create_index(conn, "ix_tickets_sla_breached_due", "tickets", ["sla_breached_at", "sla_due_at"])
+    create_index(conn, "ix_tickets_sla_due_id", "tickets", ["sla_due_at", "id"])
+    drop_index(conn, "ix_tickets_sla_due_breached", "tickets")
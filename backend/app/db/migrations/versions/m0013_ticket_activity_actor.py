@@ -0,0 +1,10 @@
+from sqlalchemy.engine import Connection
+
+from app.db.migrations.ops import drop_foreign_key
+
+version = 13
+description = "Conservar el historial de actividad de los usuarios eliminados"
+
+
+def upgrade(conn: Connection) -> None:
+    drop_foreign_key(conn, "ticket_activity", ["actor_id"])
@@ -0,0 +1,10 @@
+from sqlalchemy.engine import Connection
+
+from app.db.migrations.ops import drop_foreign_key
+
+version = 14
+description = "Conservar las revisiones de wiki de los usuarios eliminados"
+
+
+def upgrade(conn: Connection) -> None:
+    drop_foreign_key(conn, "wiki_revisions", ["author_id"])
@@ -0,0 +1,79 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, MutableMapping
+
+from fastapi import Request
+
+from app.core.config import settings
+from app.db.session import replica_engines
+
+READ_YOUR_WRITES_COOKIE = "octopus_rw"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class RecentWrites:
+    def __init__(self, max_entries: int = 10000) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark(self, key: str, window: float) -> None:
+        with self._lock:
+            self._entries[key] = time.monotonic() + window
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def seen(self, key: str) -> bool:
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is None:
+                return False
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False
+            return True
+
+
+recent_writes = RecentWrites()
+
+
+def client_key(headers: MutableMapping[str, str], client: Any) -> str:
+    authorization = headers.get("authorization")
+    if authorization:
+        return authorization
+    return client[0] if client else "-"
+
+
+def sticky_enabled() -> bool:
+    return bool(replica_engines) and settings.read_your_writes_seconds > 0
+
+
+def reads_from_primary(request: Request) -> bool:
+    if not sticky_enabled():
+        return False
+    if READ_YOUR_WRITES_COOKIE in request.cookies:
+        return True
+    return recent_writes.seen(client_key(request.headers, request.client))
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app: Callable) -> None:
+        self.app = app
+
+    async def __call__(self, scope: MutableMapping[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or not sticky_enabled():
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: MutableMapping[str, Any]) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                window = settings.read_your_writes_seconds
+                request = Request(scope)
+                recent_writes.mark(client_key(request.headers, request.client), window)
+                cookie = f"{READ_YOUR_WRITES_COOKIE}=1; Max-Age={int(window) or 1}; Path=/; HttpOnly; SameSite=Lax"
+                message.setdefault("headers", []).append((b"set-cookie", cookie.encode("latin-1")))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,16 +1,86 @@
+from itertools import cycle
+from typing import Any, AsyncGenerator, Dict, List
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from app.core.config import settings
+from app.core.metrics import timed_async_checkout, timed_checkout
+
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def pool_options(url: str) -> Dict[str, Any]:
+    parsed = make_url(url)
+    if not issubclass(parsed.get_dialect().get_pool_class(parsed), QueuePool):
+        return {}
+    return {
+        "pool_size": settings.pool_size,
+        "max_overflow": settings.max_overflow,
+        "pool_recycle": settings.pool_recycle,
+        "pool_timeout": settings.pool_timeout,
+    }
+
+
+def build_engine(url: str) -> Engine:
+    return create_engine(url, pool_pre_ping=True, **pool_options(url))
+
+
+def build_async_engine(url: str) -> AsyncEngine:
+    return create_async_engine(url, pool_pre_ping=True, **pool_options(url))
 
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+engine = build_engine(settings.database_url)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = build_async_engine(settings.async_database_url or async_database_url(settings.database_url))
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+replica_engines: List[Engine] = [build_engine(url) for url in settings.database_replica_urls]
+async_replica_engines: List[AsyncEngine] = [
+    build_async_engine(async_database_url(url)) for url in settings.database_replica_urls
+]
+_read_sessions = cycle(
+    [sessionmaker(autocommit=False, autoflush=False, bind=replica) for replica in replica_engines] or [SessionLocal]
+)
+_async_read_sessions = cycle(
+    [async_sessionmaker(replica, autoflush=False, expire_on_commit=False) for replica in async_replica_engines]
+    or [AsyncSessionLocal]
+)
+
+
+def read_sessionmaker() -> sessionmaker:
+    return next(_read_sessions)
+
+
+def async_read_sessionmaker() -> async_sessionmaker:
+    return next(_async_read_sessions)
+
 
 def get_db() -> Session:
     db = SessionLocal()
     try:
+        timed_checkout(db)
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        await timed_async_checkout(db)
+        yield db
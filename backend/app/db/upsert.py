@@ -0,0 +1,46 @@
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.orm import Session
+
+
+def _is_mysql(db: Session) -> bool:
+    return db.get_bind().dialect.name == "mysql"
+
+
+def increment(db: Session, table: Table, keys: Dict[str, Any], amounts: Dict[str, Any]) -> None:
+    values = {**keys, **amounts}
+    if _is_mysql(db):
+        statement = mysql.insert(table).values(**values)
+        statement = statement.on_duplicate_key_update(
+            {column: table.c[column] + statement.inserted[column] for column in amounts}
+        )
+    else:
+        statement = sqlite.insert(table).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={column: table.c[column] + statement.excluded[column] for column in amounts},
+        )
+    db.execute(statement)
+
+
+def upsert(
+    db: Session,
+    table: Table,
+    rows: List[Dict[str, Any]],
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str],
+) -> None:
+    if not rows:
+        return
+    if _is_mysql(db):
+        statement = mysql.insert(table).values(rows)
+        statement = statement.on_duplicate_key_update({column: statement.inserted[column] for column in update_columns})
+    else:
+        statement = sqlite.insert(table).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(conflict_columns),
+            set_={column: statement.excluded[column] for column in update_columns},
+        )
+    db.execute(statement)
@@ -1,16 +1,24 @@
+import asyncio
 import logging
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from sqlalchemy.orm import Session
 
 from app import models  # noqa: F401
 from app.api.api_v1.api import api_router
+from app.core.challenge_store import challenge_store
 from app.core.config import settings
-from app.core.security import get_password_hash
-from app.db.base import Base
-from app.db.session import SessionLocal, engine
+from app.core.metrics import MetricsMiddleware, instrument_engine, render_metrics
+from app.core.rate_limit import RateLimitExceeded
+from app.core.security import PasswordHasherBusyError, get_password_hash, password_hasher
+from app.db import migrations
+from app.db.routing import ReadYourWritesMiddleware
+from app.db.session import SessionLocal, async_engine, async_replica_engines, engine, replica_engines
 from app.models.user import User, UserRole
+from app.services import search, ticket_counters
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -35,12 +43,48 @@ def create_startup_admin() -> None:
         db.close()
 
 
+def init_derived_data() -> None:
+    db: Session = SessionLocal()
+    try:
+        ticket_counters.ensure_built(db)
+        search.get_backend(db).ensure_ready(db)
+    finally:
+        db.close()
+
+
+def ensure_schema() -> None:
+    if migrations.is_current(engine):
+        return
+    if settings.migrate_on_startup:
+        migrations.upgrade(engine)
+        return
+    with engine.connect() as conn:
+        logger.warning(
+            "El esquema está en la versión %s y la última es %s: ejecuta 'python -m app.cli migrate'",
+            migrations.current_version(conn),
+            migrations.latest_version(),
+        )
+
+
 def init_db() -> None:
-    Base.metadata.create_all(bind=engine)
+    ensure_schema()
     create_startup_admin()
+    init_derived_data()
+
+
+async def reap_two_factor_challenges() -> None:
+    while True:
+        await asyncio.sleep(settings.two_factor_reap_interval_seconds)
+        try:
+            reaped = await run_in_threadpool(challenge_store.reap, settings.two_factor_reap_batch_size)
+            if reaped:
+                logger.info("Códigos 2FA caducados eliminados: %s", reaped)
+        except Exception:  # noqa: BLE001
+            logger.exception("Error eliminando códigos 2FA caducados")
 
 
 app = FastAPI(title=settings.app_name)
+background_tasks: list[asyncio.Task] = []
 
 
 if settings.cors_origins:
@@ -61,9 +105,52 @@ else:
     )
 
 
+if settings.metrics_enabled:
+    instrument_engine(engine, "sync")
+    instrument_engine(async_engine.sync_engine, "async")
+    for index, replica in enumerate(replica_engines):
+        instrument_engine(replica, f"replica-{index}")
+    for index, replica in enumerate(async_replica_engines):
+        instrument_engine(replica.sync_engine, f"async-replica-{index}")
+    app.add_middleware(MetricsMiddleware)
+
+
+app.add_middleware(ReadYourWritesMiddleware)
+
+
+@app.exception_handler(PasswordHasherBusyError)
+async def password_hasher_busy_handler(_: Request, exc: PasswordHasherBusyError) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Servicio de autenticación saturado, inténtalo de nuevo"},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_handler(_: Request, exc: RateLimitExceeded) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "Demasiados intentos, inténtalo más tarde"},
+        headers={"Retry-After": exc.retry_after_header},
+    )
+
+
 @app.on_event("startup")
 async def on_startup() -> None:
     init_db()
+    if settings.two_factor_reap_interval_seconds > 0:
+        background_tasks.append(asyncio.create_task(reap_two_factor_challenges()))
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    for task in background_tasks:
+        task.cancel()
+    password_hasher.shutdown()
+    await async_engine.dispose()
+    for replica in async_replica_engines:
+        await replica.dispose()
 
 
 @app.get("/health")
@@ -71,4 +158,11 @@ async def health_check() -> dict[str, str]:
     return {"status": "ok"}
 
 
+if settings.metrics_enabled:
+
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    async def metrics() -> PlainTextResponse:
+        return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 app.include_router(api_router)
@@ -1,6 +1,13 @@
+from .change_log import ChangeLogEntry  # noqa: F401
 from .inventory import InventoryItem  # noqa: F401
+from .outbox import OutboxEvent  # noqa: F401
 from .project import Project  # noqa: F401
+from .sla import SlaPolicy  # noqa: F401
 from .ticket import Ticket  # noqa: F401
+from .ticket_activity import TicketActivity  # noqa: F401
+from .ticket_counter import TicketStatusCount  # noqa: F401
+from .ticket_rollup import TicketDailyStat  # noqa: F401
 from .two_factor import TwoFactorToken  # noqa: F401
 from .user import User, UserRole  # noqa: F401
 from .wiki import WikiPage  # noqa: F401
+from .wiki_revision import WikiRevision  # noqa: F401
@@ -0,0 +1,27 @@
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import Boolean, Column, DateTime, Enum as SqlEnum, Index, Integer
+
+from app.db.base import Base
+
+
+class ChangeEntity(str, Enum):
+    TICKET = "TICKET"
+    PROYECTO = "PROYECTO"
+    WIKI = "WIKI"
+    INVENTARIO = "INVENTARIO"
+
+
+class ChangeLogEntry(Base):
+    __tablename__ = "change_log"
+    __table_args__ = (
+        Index("ix_change_log_entity_entity_id", "entity", "entity_id"),
+        Index("ix_change_log_entity_seq", "entity", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column(SqlEnum(ChangeEntity), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    deleted = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
@@ -0,0 +1,38 @@
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import Column, DateTime, Enum as SqlEnum, Index, Integer, String, Text
+
+from app.db.base import Base
+
+
+class OutboxChannel(str, Enum):
+    EMAIL = "EMAIL"
+    WEBHOOK = "WEBHOOK"
+
+
+class OutboxStatus(str, Enum):
+    PENDIENTE = "PENDIENTE"
+    PROCESANDO = "PROCESANDO"
+    ENVIADO = "ENVIADO"
+    FALLIDO = "FALLIDO"
+
+
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        Index("ix_outbox_events_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_type = Column(String(64), nullable=False)
+    channel = Column(SqlEnum(OutboxChannel), nullable=False)
+    target = Column(String(512), nullable=True)
+    payload = Column(Text, nullable=False)
+    status = Column(SqlEnum(OutboxStatus), nullable=False, default=OutboxStatus.PENDIENTE)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    locked_until = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    delivered_at = Column(DateTime, nullable=True)
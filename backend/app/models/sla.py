@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Enum as SqlEnum, ForeignKey, Integer, UniqueConstraint
+
+from app.db.base import Base
+from app.models.ticket import TicketPriority
+
+
+class SlaPolicy(Base):
+    __tablename__ = "sla_policies"
+    __table_args__ = (
+        UniqueConstraint("project_id", "priority", name="uq_sla_policies_project_priority"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=True)
+    priority = Column(SqlEnum(TicketPriority), nullable=False)
+    response_minutes = Column(Integer, nullable=True)
+    resolution_minutes = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
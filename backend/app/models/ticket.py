@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import Column, DateTime, Enum as SqlEnum, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, Enum as SqlEnum, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -24,6 +24,20 @@ class TicketStatus(str, Enum):
 
 class Ticket(Base):
     __tablename__ = "tickets"
+    __table_args__ = (
+        Index("ix_tickets_project_status_created_id", "project_id", "status", "created_at", "id"),
+        Index("ix_tickets_project_created_id", "project_id", "created_at", "id"),
+        Index("ix_tickets_created_id", "created_at", "id"),
+        Index("ix_tickets_status_created_id", "status", "created_at", "id"),
+        Index("ix_tickets_priority_created_id", "priority", "created_at", "id"),
+        Index("ix_tickets_assignee_created_id", "assignee_id", "created_at", "id"),
+        Index("ix_tickets_reporter_created_id", "reporter_id", "created_at", "id"),
+        Index("ix_tickets_project_priority", "project_id", "priority"),
+        Index("ix_tickets_project_assignee", "project_id", "assignee_id"),
+        Index("ix_tickets_sla_breached_due", "sla_breached_at", "sla_due_at"),
+        Index("ix_tickets_sla_due_id", "sla_due_at", "id"),
+        Index("ft_tickets_title_description", "title", "description", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
@@ -35,8 +49,11 @@ class Ticket(Base):
     status = Column(SqlEnum(TicketStatus), nullable=False, default=TicketStatus.PENDIENTE)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True
     )
+    resolved_at = Column(DateTime, nullable=True)
+    sla_due_at = Column(DateTime, nullable=True)
+    sla_breached_at = Column(DateTime, nullable=True)
 
     project = relationship("Project", back_populates="tickets")
     reporter = relationship("User", back_populates="reported_tickets", foreign_keys=[reporter_id])
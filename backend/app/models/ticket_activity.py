@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+
+from app.db.base import Base
+
+
+class TicketActivity(Base):
+    __tablename__ = "ticket_activity"
+    __table_args__ = (
+        Index("ix_ticket_activity_ticket_created", "ticket_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    ticket_id = Column(Integer, nullable=False)
+    actor_id = Column(Integer, nullable=True)
+    field = Column(String(64), nullable=False)
+    old_value = Column(Text, nullable=True)
+    new_value = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
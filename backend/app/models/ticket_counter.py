@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Enum as SqlEnum, ForeignKey, Integer
+
+from app.db.base import Base
+from app.models.ticket import TicketStatus
+
+
+class TicketStatusCount(Base):
+    __tablename__ = "ticket_status_counts"
+
+    project_id = Column(Integer, ForeignKey("projects.id"), primary_key=True)
+    status = Column(SqlEnum(TicketStatus), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
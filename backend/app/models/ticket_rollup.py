@@ -0,0 +1,18 @@
+from sqlalchemy import BigInteger, Column, Date, Enum as SqlEnum, ForeignKey, Index, Integer
+
+from app.db.base import Base
+from app.models.ticket import TicketPriority
+
+
+class TicketDailyStat(Base):
+    __tablename__ = "ticket_daily_stats"
+    __table_args__ = (
+        Index("ix_ticket_daily_stats_project_day", "project_id", "day"),
+    )
+
+    day = Column(Date, primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), primary_key=True)
+    priority = Column(SqlEnum(TicketPriority), primary_key=True)
+    created = Column(Integer, nullable=False, default=0)
+    resolved = Column(Integer, nullable=False, default=0)
+    resolution_seconds = Column(BigInteger, nullable=False, default=0)
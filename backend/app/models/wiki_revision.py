@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, LargeBinary, String, UniqueConstraint
+from sqlalchemy.dialects import mysql
+
+from app.db.base import Base
+
+
+class WikiRevision(Base):
+    __tablename__ = "wiki_revisions"
+    __table_args__ = (
+        UniqueConstraint("wiki_id", "revision", name="uq_wiki_revisions_wiki_revision"),
+        Index("ix_wiki_revisions_wiki_snapshot_revision", "wiki_id", "is_snapshot", "revision"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    wiki_id = Column(Integer, ForeignKey("wikis.id"), nullable=False)
+    revision = Column(Integer, nullable=False)
+    author_id = Column(Integer, nullable=True)
+    title = Column(String(255), nullable=False)
+    is_snapshot = Column(Boolean, nullable=False, default=False)
+    content_size = Column(Integer, nullable=False)
+    payload = Column(LargeBinary().with_variant(mysql.LONGBLOB(), "mysql"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from app.models.change_log import ChangeEntity
+
+
+class ChangeOut(BaseModel):
+    seq: int
+    entity: ChangeEntity
+    id: int
+    deleted: bool
+    changed_at: datetime
+    data: Optional[Dict[str, Any]] = None
+
+
+class ChangePage(BaseModel):
+    items: List[ChangeOut]
+    next_since: int
+    has_more: bool
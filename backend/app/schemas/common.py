@@ -1,7 +1,9 @@
 from datetime import datetime
 
+from pydantic import BaseModel
 
-class ORMBase:
+
+class ORMBase(BaseModel):
     class Config:
         orm_mode = True
         allow_population_by_field_name = True
@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -37,3 +37,15 @@ class InventoryOut(InventoryBase, ORMBase):
     id: int
     created_at: datetime
     updated_at: datetime
+
+
+class InventoryImportError(BaseModel):
+    line: int
+    errors: List[str]
+
+
+class InventoryImportSummary(BaseModel):
+    inserted: int = 0
+    updated: int = 0
+    rejected: int = 0
+    errors: List[InventoryImportError] = []
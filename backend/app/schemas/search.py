@@ -0,0 +1,23 @@
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class SearchKind(str, Enum):
+    TICKET = "ticket"
+    WIKI = "wiki"
+
+
+class SearchHit(BaseModel):
+    kind: SearchKind
+    id: int
+    project_id: int
+    title: str
+    snippet: str
+    score: float
+
+
+class SearchPage(BaseModel):
+    items: List[SearchHit]
+    next_offset: Optional[int] = None
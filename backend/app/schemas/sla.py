@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, conint
+
+from app.models.ticket import TicketPriority
+from app.schemas.common import ORMBase
+
+
+class SlaPolicyBase(BaseModel):
+    project_id: Optional[int] = None
+    priority: TicketPriority
+    response_minutes: Optional[conint(gt=0)] = None
+    resolution_minutes: conint(gt=0)
+
+
+class SlaPolicyCreate(SlaPolicyBase):
+    pass
+
+
+class SlaPolicyUpdate(BaseModel):
+    response_minutes: Optional[conint(gt=0)]
+    resolution_minutes: Optional[conint(gt=0)]
+
+
+class SlaPolicyOut(SlaPolicyBase, ORMBase):
+    id: int
+    created_at: datetime
+    updated_at: datetime
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -33,3 +33,67 @@ class TicketOut(TicketBase, ORMBase):
     reporter_id: int
     created_at: datetime
     updated_at: datetime
+    resolved_at: Optional[datetime] = None
+    sla_due_at: Optional[datetime] = None
+    sla_breached_at: Optional[datetime] = None
+
+
+class TicketFilters(BaseModel):
+    project_id: Optional[int] = None
+    statuses: List[TicketStatus] = []
+    priorities: List[TicketPriority] = []
+    assignee_id: Optional[int] = None
+    reporter_id: Optional[int] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    updated_from: Optional[datetime] = None
+    updated_to: Optional[datetime] = None
+
+
+class AssigneeFacet(BaseModel):
+    assignee_id: Optional[int]
+    count: int
+
+
+class TicketFacets(BaseModel):
+    status: Dict[TicketStatus, int] = {}
+    priority: Dict[TicketPriority, int] = {}
+    assignee: List[AssigneeFacet] = []
+
+
+class TicketPage(BaseModel):
+    items: List[TicketOut]
+    next_cursor: Optional[str] = None
+    facets: Optional[TicketFacets] = None
+
+
+class TicketBulkUpdateItem(TicketUpdate):
+    id: int
+
+
+class TicketBulkResult(BaseModel):
+    index: int
+    ok: bool
+    ticket: Optional[TicketOut] = None
+    error: Optional[str] = None
+
+
+class TicketBulkResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[TicketBulkResult]
+
+
+class TicketActivityOut(ORMBase):
+    id: int
+    ticket_id: int
+    actor_id: Optional[int]
+    field: str
+    old_value: Optional[str]
+    new_value: Optional[str]
+    created_at: datetime
+
+
+class TicketActivityPage(BaseModel):
+    items: List[TicketActivityOut]
+    next_cursor: Optional[str] = None
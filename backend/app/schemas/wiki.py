@@ -26,3 +26,27 @@ class WikiOut(WikiBase, ORMBase):
     author_id: int
     created_at: datetime
     updated_at: datetime
+
+
+class WikiRevisionOut(BaseModel):
+    revision: int
+    author_id: Optional[int]
+    title: str
+    is_snapshot: bool
+    content_size: int
+    stored_size: int
+    created_at: datetime
+
+
+class WikiRevisionContent(BaseModel):
+    revision: int
+    author_id: Optional[int]
+    title: str
+    content: str
+    created_at: datetime
+
+
+class WikiRevisionDiff(BaseModel):
+    from_revision: int
+    to_revision: int
+    diff: str
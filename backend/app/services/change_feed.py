@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import ScalarSelect, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.change_log import ChangeEntity, ChangeLogEntry
+
+
+def record(db: Session, entity: ChangeEntity, ids: Iterable[int], deleted: bool = False) -> None:
+    ids = sorted({entity_id for entity_id in ids if entity_id is not None})
+    if not ids:
+        return
+    db.execute(delete(ChangeLogEntry).where(ChangeLogEntry.entity == entity, ChangeLogEntry.entity_id.in_(ids)))
+    now = datetime.utcnow()
+    db.execute(
+        insert(ChangeLogEntry),
+        [{"entity": entity, "entity_id": entity_id, "deleted": deleted, "created_at": now} for entity_id in ids],
+    )
+
+
+def record_deleted(db: Session, entity: ChangeEntity, ids: Iterable[int]) -> None:
+    record(db, entity, ids, deleted=True)
+
+
+def sequence(entity: ChangeEntity, entity_id: Optional[int] = None) -> ScalarSelect:
+    statement = select(func.max(ChangeLogEntry.id)).where(ChangeLogEntry.entity == entity)
+    if entity_id is not None:
+        statement = statement.where(ChangeLogEntry.entity_id == entity_id)
+    return statement.scalar_subquery()
@@ -0,0 +1,98 @@
+import hashlib
+import hmac
+import json
+import logging
+import smtplib
+import urllib.error
+import urllib.request
+from abc import ABC, abstractmethod
+from email.message import EmailMessage
+from typing import Any, Dict, Optional, Sequence
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class DeliveryError(RuntimeError):
+    pass
+
+
+class EmailSender(ABC):
+    @abstractmethod
+    def send(self, recipients: Sequence[str], subject: str, body: str) -> None:
+        ...
+
+
+class LoggingEmailSender(EmailSender):
+    def send(self, recipients: Sequence[str], subject: str, body: str) -> None:
+        logger.info("EMAIL para %s: %s\n%s", ", ".join(recipients), subject, body)
+
+
+class SmtpEmailSender(EmailSender):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        sender: str,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: bool = False,
+        timeout: float = 10,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+
+    def send(self, recipients: Sequence[str], subject: str, body: str) -> None:
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = ", ".join(recipients)
+        message["Subject"] = subject
+        message.set_content(body)
+        try:
+            with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+                if self.starttls:
+                    smtp.starttls()
+                if self.username:
+                    smtp.login(self.username, self.password or "")
+                smtp.send_message(message)
+        except (OSError, smtplib.SMTPException) as exc:
+            raise DeliveryError(f"SMTP: {exc}") from exc
+
+
+def sign_payload(body: bytes, secret: str) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def post_webhook(url: str, event_type: str, payload: Dict[str, Any]) -> None:
+    body = json.dumps(payload, ensure_ascii=False).encode()
+    headers = {"Content-Type": "application/json", "X-Octopus-Event": event_type}
+    if settings.webhook_secret:
+        headers["X-Octopus-Signature"] = sign_payload(body, settings.webhook_secret)
+    request = urllib.request.Request(url, data=body, headers=headers, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=settings.webhook_timeout_seconds) as response:
+            response.read()
+    except urllib.error.HTTPError as exc:
+        raise DeliveryError(f"HTTP {exc.code} desde {url}") from exc
+    except (OSError, ValueError) as exc:
+        raise DeliveryError(f"Webhook {url}: {exc}") from exc
+
+
+def build_email_sender() -> EmailSender:
+    if not settings.smtp_host:
+        return LoggingEmailSender()
+    return SmtpEmailSender(
+        host=settings.smtp_host,
+        port=settings.smtp_port,
+        sender=settings.smtp_from,
+        username=settings.smtp_username,
+        password=settings.smtp_password,
+        starttls=settings.smtp_starttls,
+        timeout=settings.smtp_timeout_seconds,
+    )
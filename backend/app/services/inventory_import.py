@@ -0,0 +1,108 @@
+import csv
+import io
+from collections import defaultdict
+from datetime import datetime
+from itertools import islice
+from typing import BinaryIO, Dict, Iterator, List, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.upsert import upsert
+from app.models.change_log import ChangeEntity
+from app.models.inventory import InventoryItem
+from app.models.project import Project
+from app.models.user import User
+from app.schemas.inventory import InventoryCreate, InventoryImportError, InventoryImportSummary
+from app.services import change_feed
+
+UPDATABLE_COLUMNS = [
+    "name",
+    "type",
+    "assigned_user_id",
+    "assigned_project_id",
+    "status",
+    "purchase_date",
+    "notes",
+]
+
+
+def _rows(reader: csv.DictReader) -> Iterator[Tuple[int, Dict[str, str]]]:
+    for row in reader:
+        yield reader.line_num, {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+
+
+def _batches(rows: Iterator[Tuple[int, Dict[str, str]]], size: int) -> Iterator[List[Tuple[int, Dict[str, str]]]]:
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _report(summary: InventoryImportSummary, line: int, errors: List[str]) -> None:
+    summary.rejected += 1
+    if len(summary.errors) < settings.inventory_import_max_reported_errors:
+        summary.errors.append(InventoryImportError(line=line, errors=errors))
+
+
+def _existing(db: Session, column, ids: Set[int]) -> Set[int]:
+    if not ids:
+        return set()
+    return {value for (value,) in db.query(column).filter(column.in_(ids))}
+
+
+def _reference_errors(item: InventoryCreate, user_ids: Set[int], project_ids: Set[int]) -> List[str]:
+    errors = []
+    if item.assigned_user_id is not None and item.assigned_user_id not in user_ids:
+        errors.append(f"assigned_user_id: el usuario {item.assigned_user_id} no existe")
+    if item.assigned_project_id is not None and item.assigned_project_id not in project_ids:
+        errors.append(f"assigned_project_id: el proyecto {item.assigned_project_id} no existe")
+    return errors
+
+
+def import_csv(db: Session, stream: BinaryIO) -> InventoryImportSummary:
+    summary = InventoryImportSummary()
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    seen_lines: Dict[str, int] = {}
+    for batch in _batches(_rows(reader), settings.inventory_import_batch_size):
+        now = datetime.utcnow()
+        parsed: List[Tuple[int, InventoryCreate, Tuple[str, ...]]] = []
+        for line, row in batch:
+            try:
+                item = InventoryCreate(**row)
+            except ValidationError as exc:
+                _report(summary, line, [f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in exc.errors()])
+                continue
+            if item.serial_number in seen_lines:
+                _report(summary, line, [f"serial_number: repetido, ya aparece en la línea {seen_lines[item.serial_number]}"])
+                continue
+            seen_lines[item.serial_number] = line
+            parsed.append((line, item, tuple(column for column in UPDATABLE_COLUMNS if column in row)))
+
+        user_ids = _existing(db, User.id, {item.assigned_user_id for _, item, _ in parsed if item.assigned_user_id is not None})
+        project_ids = _existing(
+            db, Project.id, {item.assigned_project_id for _, item, _ in parsed if item.assigned_project_id is not None}
+        )
+        groups: Dict[Tuple[str, ...], List[dict]] = defaultdict(list)
+        for line, item, provided in parsed:
+            errors = _reference_errors(item, user_ids, project_ids)
+            if errors:
+                _report(summary, line, errors)
+                continue
+            groups[provided].append({**item.dict(), "created_at": now, "updated_at": now})
+        serials = [row["serial_number"] for rows in groups.values() for row in rows]
+        if not serials:
+            continue
+
+        existing = {
+            serial
+            for (serial,) in db.query(InventoryItem.serial_number).filter(InventoryItem.serial_number.in_(serials))
+        }
+        for provided, rows in groups.items():
+            upsert(db, InventoryItem.__table__, rows, ["serial_number"], [*provided, "updated_at"])
+        ids = [item_id for (item_id,) in db.query(InventoryItem.id).filter(InventoryItem.serial_number.in_(serials))]
+        change_feed.record(db, ChangeEntity.INVENTARIO, ids)
+        db.commit()
+        summary.updated += len(existing)
+        summary.inserted += len(serials) - len(existing)
+    summary.errors.sort(key=lambda error: error.line)
+    return summary
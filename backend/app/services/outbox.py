@@ -0,0 +1,224 @@
+import json
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Select, and_, inspect, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.outbox import OutboxChannel, OutboxEvent, OutboxStatus
+from app.models.ticket import Ticket, TicketStatus
+from app.models.user import User
+from app.services.delivery import EmailSender, build_email_sender, post_webhook
+
+logger = logging.getLogger(__name__)
+
+TICKET_CREATED = "ticket.created"
+TICKET_ASSIGNED = "ticket.assigned"
+TICKET_STATUS_CHANGED = "ticket.status_changed"
+TICKET_SLA_BREACHED = "ticket.sla_breached"
+
+SUBJECTS = {
+    TICKET_CREATED: "Nuevo ticket #{id}: {title}",
+    TICKET_ASSIGNED: "Se te ha asignado el ticket #{id}: {title}",
+    TICKET_STATUS_CHANGED: "El ticket #{id} ha pasado a {status}",
+    TICKET_SLA_BREACHED: "El ticket #{id} ha incumplido su SLA: {title}",
+}
+
+
+@dataclass
+class PendingTicketEvent:
+    ticket: Ticket
+    event_type: str
+    previous: Dict[str, Any]
+
+
+def _previous_value(ticket: Ticket, attribute: str) -> Any:
+    history = inspect(ticket).attrs[attribute].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(ticket, attribute)
+
+
+def collect_ticket_events(changes: Iterable[Tuple[Optional[Tuple[int, TicketStatus]], Ticket]]) -> List[PendingTicketEvent]:
+    events = []
+    for previous, ticket in changes:
+        if previous is None:
+            events.append(PendingTicketEvent(ticket, TICKET_CREATED, {}))
+            continue
+        old_status = previous[1]
+        old_assignee_id = _previous_value(ticket, "assignee_id")
+        if ticket.assignee_id is not None and ticket.assignee_id != old_assignee_id:
+            events.append(PendingTicketEvent(ticket, TICKET_ASSIGNED, {"assignee_id": old_assignee_id}))
+        if ticket.status != old_status:
+            events.append(PendingTicketEvent(ticket, TICKET_STATUS_CHANGED, {"status": old_status.value}))
+    return events
+
+
+def _ticket_payload(event: PendingTicketEvent) -> Dict[str, Any]:
+    ticket = event.ticket
+    return {
+        "event": event.event_type,
+        "occurred_at": datetime.utcnow().isoformat(),
+        "ticket": {
+            "id": ticket.id,
+            "project_id": ticket.project_id,
+            "title": ticket.title,
+            "status": ticket.status.value,
+            "priority": ticket.priority.value,
+            "reporter_id": ticket.reporter_id,
+            "assignee_id": ticket.assignee_id,
+        },
+        "previous": event.previous,
+    }
+
+
+def enqueue_ticket_events(db: Session, events: List[PendingTicketEvent]) -> None:
+    for event in events:
+        payload = json.dumps(_ticket_payload(event), ensure_ascii=False)
+        if settings.notifications_email_enabled:
+            db.add(OutboxEvent(event_type=event.event_type, channel=OutboxChannel.EMAIL, payload=payload))
+        for url in settings.webhook_urls:
+            db.add(OutboxEvent(event_type=event.event_type, channel=OutboxChannel.WEBHOOK, target=url, payload=payload))
+
+
+def backoff_delay(attempts: int) -> float:
+    delay = min(settings.outbox_backoff_max_seconds, settings.outbox_backoff_seconds * 2 ** (attempts - 1))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def claimable(now: datetime, limit: int) -> Select:
+    return (
+        select(OutboxEvent)
+        .where(
+            or_(
+                and_(OutboxEvent.status == OutboxStatus.PENDIENTE, OutboxEvent.next_attempt_at <= now),
+                and_(OutboxEvent.status == OutboxStatus.PROCESANDO, OutboxEvent.locked_until < now),
+            )
+        )
+        .order_by(OutboxEvent.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+
+
+@dataclass
+class ClaimedEvent:
+    id: int
+    event_type: str
+    channel: OutboxChannel
+    target: Optional[str]
+    payload: Dict[str, Any]
+    attempts: int
+    recipients: List[str]
+
+
+class OutboxWorker:
+    def __init__(self, email_sender: Optional[EmailSender] = None) -> None:
+        self.email_sender = email_sender or build_email_sender()
+        self._executor = ThreadPoolExecutor(max_workers=settings.outbox_concurrency, thread_name_prefix="outbox")
+
+    def _recipients(self, db: Session, payload: Dict[str, Any]) -> List[str]:
+        ticket = payload["ticket"]
+        if payload["event"] == TICKET_ASSIGNED:
+            user_ids = {ticket["assignee_id"]}
+        else:
+            user_ids = {ticket["reporter_id"], ticket["assignee_id"]}
+        user_ids.discard(None)
+        if not user_ids:
+            return []
+        return list(db.scalars(select(User.email).where(User.id.in_(user_ids), User.is_active.is_(True))))
+
+    def claim(self) -> List[ClaimedEvent]:
+        now = datetime.utcnow()
+        with SessionLocal() as db:
+            rows = db.scalars(claimable(now, settings.outbox_batch_size)).all()
+            claimed = []
+            for row in rows:
+                row.status = OutboxStatus.PROCESANDO
+                row.locked_until = now + timedelta(seconds=settings.outbox_lease_seconds)
+                payload = json.loads(row.payload)
+                recipients = self._recipients(db, payload) if row.channel == OutboxChannel.EMAIL else []
+                claimed.append(
+                    ClaimedEvent(row.id, row.event_type, row.channel, row.target, payload, row.attempts, recipients)
+                )
+            db.commit()
+        return claimed
+
+    def deliver(self, event: ClaimedEvent) -> None:
+        if event.channel == OutboxChannel.WEBHOOK:
+            post_webhook(event.target, event.event_type, event.payload)
+            return
+        if not event.recipients:
+            return
+        ticket = event.payload["ticket"]
+        subject = SUBJECTS.get(event.event_type, "{title}").format(**ticket)
+        body = "\n".join(
+            [
+                f"Ticket #{ticket['id']}: {ticket['title']}",
+                f"Estado: {ticket['status']}",
+                f"Prioridad: {ticket['priority']}",
+            ]
+        )
+        self.email_sender.send(event.recipients, subject, body)
+
+    def _attempt(self, event: ClaimedEvent) -> Optional[str]:
+        try:
+            self.deliver(event)
+            return None
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Fallo entregando el evento %s (%s): %s", event.id, event.channel.value, exc)
+            return str(exc) or type(exc).__name__
+
+    def record(self, results: List[Tuple[ClaimedEvent, Optional[str]]]) -> None:
+        now = datetime.utcnow()
+        with SessionLocal() as db:
+            for event, error in results:
+                row = db.get(OutboxEvent, event.id)
+                if row is None:
+                    continue
+                row.attempts = event.attempts + 1
+                row.locked_until = None
+                if error is None:
+                    row.status = OutboxStatus.ENVIADO
+                    row.delivered_at = now
+                    row.last_error = None
+                elif row.attempts >= settings.outbox_max_attempts:
+                    row.status = OutboxStatus.FALLIDO
+                    row.last_error = error
+                else:
+                    row.status = OutboxStatus.PENDIENTE
+                    row.next_attempt_at = now + timedelta(seconds=backoff_delay(row.attempts))
+                    row.last_error = error
+            db.commit()
+
+    def run_once(self) -> int:
+        claimed = self.claim()
+        if not claimed:
+            return 0
+        errors = list(self._executor.map(self._attempt, claimed))
+        self.record(list(zip(claimed, errors)))
+        return len(claimed)
+
+    def run_forever(self) -> None:
+        logger.info("Worker de outbox en marcha (lotes de %s, %s entregas concurrentes)", settings.outbox_batch_size, settings.outbox_concurrency)
+        try:
+            while True:
+                try:
+                    processed = self.run_once()
+                except Exception:  # noqa: BLE001
+                    logger.exception("Error procesando el outbox")
+                    processed = 0
+                if processed < settings.outbox_batch_size:
+                    time.sleep(settings.outbox_poll_interval_seconds)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,284 @@
+import math
+import re
+import threading
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.ticket import Ticket
+from app.models.wiki import WikiPage
+from app.schemas.search import SearchHit, SearchKind
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+SNIPPET_CHARS = 160
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    folded = "".join(
+        char for char in unicodedata.normalize("NFKD", value or "") if not unicodedata.combining(char)
+    )
+    return [token.lower() for token in TOKEN_RE.findall(folded)]
+
+
+def make_snippet(body: Optional[str], terms: List[str]) -> str:
+    body = body or ""
+    lowered = body.lower()
+    positions = [lowered.find(term) for term in terms if term in lowered]
+    start = max(min(positions) - SNIPPET_CHARS // 4, 0) if positions else 0
+    snippet = body[start:start + SNIPPET_CHARS]
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if start + SNIPPET_CHARS < len(body) else ""
+    return f"{prefix}{snippet}{suffix}"
+
+
+def _document(kind: SearchKind, obj) -> Tuple[SearchKind, int, int, str, str]:
+    body = obj.description if kind == SearchKind.TICKET else obj.content
+    return kind, obj.id, obj.project_id, obj.title, body or ""
+
+
+class SearchBackend(ABC):
+    def index(self, db: Session, kind: SearchKind, obj) -> None:
+        pass
+
+    def remove(self, db: Session, kind: SearchKind, ref_id: int) -> None:
+        pass
+
+    def rebuild(self, db: Session) -> None:
+        pass
+
+    def ensure_ready(self, db: Session) -> None:
+        pass
+
+    @abstractmethod
+    def search(self, db: Session, query: str, limit: int, offset: int) -> List[SearchHit]:
+        ...
+
+
+class MySQLFullTextBackend(SearchBackend):
+
+    SQL = text(
+        """
+        SELECT kind, id, project_id, title, body, score FROM (
+            SELECT 'ticket' AS kind, id, project_id, title, description AS body,
+                   MATCH(title, description) AGAINST (:query IN NATURAL LANGUAGE MODE) AS score
+            FROM tickets
+            WHERE MATCH(title, description) AGAINST (:query IN NATURAL LANGUAGE MODE)
+            UNION ALL
+            SELECT 'wiki' AS kind, id, project_id, title, content AS body,
+                   MATCH(title, content) AGAINST (:query IN NATURAL LANGUAGE MODE) AS score
+            FROM wikis
+            WHERE MATCH(title, content) AGAINST (:query IN NATURAL LANGUAGE MODE)
+        ) AS hits
+        ORDER BY score DESC, id DESC
+        LIMIT :limit OFFSET :offset
+        """
+    )
+
+    def search(self, db: Session, query: str, limit: int, offset: int) -> List[SearchHit]:
+        terms = tokenize(query)
+        rows = db.execute(self.SQL, {"query": query, "limit": limit, "offset": offset})
+        return [
+            SearchHit(
+                kind=kind,
+                id=ref_id,
+                project_id=project_id,
+                title=title,
+                snippet=make_snippet(body, terms),
+                score=float(score),
+            )
+            for kind, ref_id, project_id, title, body, score in rows
+        ]
+
+
+class SqliteFts5Backend(SearchBackend):
+
+    def _create_table(self, db: Session) -> None:
+        db.execute(
+            text(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+                "kind UNINDEXED, ref_id UNINDEXED, project_id UNINDEXED, title, body, "
+                "tokenize='unicode61 remove_diacritics 2')"
+            )
+        )
+
+    def ensure_ready(self, db: Session) -> None:
+        self._create_table(db)
+        indexed = db.execute(text("SELECT 1 FROM search_index LIMIT 1")).first()
+        if not indexed:
+            self.rebuild(db)
+        db.commit()
+
+    def index(self, db: Session, kind: SearchKind, obj) -> None:
+        self.remove(db, kind, obj.id)
+        kind, ref_id, project_id, title, body = _document(kind, obj)
+        db.execute(
+            text("INSERT INTO search_index (kind, ref_id, project_id, title, body) VALUES (:kind, :ref_id, :project_id, :title, :body)"),
+            {"kind": kind.value, "ref_id": ref_id, "project_id": project_id, "title": title, "body": body},
+        )
+
+    def remove(self, db: Session, kind: SearchKind, ref_id: int) -> None:
+        db.execute(text("DELETE FROM search_index WHERE kind = :kind AND ref_id = :ref_id"), {"kind": kind.value, "ref_id": ref_id})
+
+    def rebuild(self, db: Session) -> None:
+        self._create_table(db)
+        db.execute(text("DELETE FROM search_index"))
+        db.execute(
+            text(
+                "INSERT INTO search_index (kind, ref_id, project_id, title, body) "
+                "SELECT 'ticket', id, project_id, title, COALESCE(description, '') FROM tickets "
+                "UNION ALL SELECT 'wiki', id, project_id, title, content FROM wikis"
+            )
+        )
+
+    def search(self, db: Session, query: str, limit: int, offset: int) -> List[SearchHit]:
+        terms = tokenize(query)
+        if not terms:
+            return []
+        match = " ".join('"{}"'.format(term.replace('"', '""')) for term in terms[:-1])
+        match = f'{match} "{terms[-1]}"*'.strip()
+        rows = db.execute(
+            text(
+                "SELECT kind, ref_id, project_id, title, "
+                "snippet(search_index, 4, '', '', '…', 24), bm25(search_index, 0, 0, 0, 2.0, 1.0) AS rank "
+                "FROM search_index WHERE search_index MATCH :match ORDER BY rank LIMIT :limit OFFSET :offset"
+            ),
+            {"match": match, "limit": limit, "offset": offset},
+        )
+        return [
+            SearchHit(kind=kind, id=ref_id, project_id=project_id, title=title, snippet=snippet, score=-rank)
+            for kind, ref_id, project_id, title, snippet, rank in rows
+        ]
+
+
+class InMemoryInvertedIndex(SearchBackend):
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[Tuple[SearchKind, int], int]] = defaultdict(dict)
+        self._documents: Dict[Tuple[SearchKind, int], Tuple[int, str, str, Counter]] = {}
+        self._loaded = False
+
+    def ensure_ready(self, db: Session) -> None:
+        with self._lock:
+            if not self._loaded:
+                self._load(db)
+
+    def rebuild(self, db: Session) -> None:
+        with self._lock:
+            self._load(db)
+
+    def _load(self, db: Session) -> None:
+        self._postings.clear()
+        self._documents.clear()
+        for ticket in db.query(Ticket).yield_per(1000):
+            self._add(*_document(SearchKind.TICKET, ticket))
+        for wiki in db.query(WikiPage).yield_per(1000):
+            self._add(*_document(SearchKind.WIKI, wiki))
+        self._loaded = True
+
+    def _add(self, kind: SearchKind, ref_id: int, project_id: int, title: str, body: str) -> None:
+        key = (kind, ref_id)
+        frequencies = Counter(tokenize(title) * 2 + tokenize(body))
+        self._documents[key] = (project_id, title, body, frequencies)
+        for term, count in frequencies.items():
+            self._postings[term][key] = count
+
+    def _discard(self, key: Tuple[SearchKind, int]) -> None:
+        document = self._documents.pop(key, None)
+        if document is None:
+            return
+        for term in document[3]:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[term]
+
+    def index(self, db: Session, kind: SearchKind, obj) -> None:
+        with self._lock:
+            if self._loaded:
+                self._discard((kind, obj.id))
+                self._add(*_document(kind, obj))
+
+    def remove(self, db: Session, kind: SearchKind, ref_id: int) -> None:
+        with self._lock:
+            self._discard((kind, ref_id))
+
+    def search(self, db: Session, query: str, limit: int, offset: int) -> List[SearchHit]:
+        self.ensure_ready(db)
+        terms = tokenize(query)
+        with self._lock:
+            total = len(self._documents) or 1
+            scores: Counter = Counter()
+            matched: Dict[Tuple[SearchKind, int], int] = Counter()
+            for term in set(terms):
+                postings = self._postings.get(term, {})
+                idf = math.log(1 + total / (1 + len(postings)))
+                for key, count in postings.items():
+                    scores[key] += (1 + math.log(count)) * idf
+                    matched[key] += 1
+            ranked = sorted(
+                (key for key in scores if matched[key] == len(set(terms))),
+                key=lambda key: (-scores[key], -key[1]),
+            )[offset:offset + limit]
+            return [
+                SearchHit(
+                    kind=kind,
+                    id=ref_id,
+                    project_id=self._documents[(kind, ref_id)][0],
+                    title=self._documents[(kind, ref_id)][1],
+                    snippet=make_snippet(self._documents[(kind, ref_id)][2], terms),
+                    score=round(scores[(kind, ref_id)], 6),
+                )
+                for kind, ref_id in ranked
+            ]
+
+
+_backends: Dict[str, SearchBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def _fts5_available(db: Session) -> bool:
+    options = {row[0] for row in db.execute(text("PRAGMA compile_options"))}
+    return "ENABLE_FTS5" in options
+
+
+def get_backend(db: Session) -> SearchBackend:
+    dialect = db.get_bind().dialect.name
+    backend = _backends.get(dialect)
+    if backend is None:
+        with _backends_lock:
+            backend = _backends.get(dialect)
+            if backend is None:
+                if dialect == "mysql":
+                    backend = MySQLFullTextBackend()
+                elif dialect == "sqlite" and _fts5_available(db):
+                    backend = SqliteFts5Backend()
+                else:
+                    backend = InMemoryInvertedIndex()
+                _backends[dialect] = backend
+    return backend
+
+
+def index_ticket(db: Session, ticket: Ticket) -> None:
+    get_backend(db).index(db, SearchKind.TICKET, ticket)
+
+
+def remove_ticket(db: Session, ticket_id: int) -> None:
+    get_backend(db).remove(db, SearchKind.TICKET, ticket_id)
+
+
+def index_wiki(db: Session, wiki: WikiPage) -> None:
+    get_backend(db).index(db, SearchKind.WIKI, wiki)
+
+
+def remove_wiki(db: Session, wiki_id: int) -> None:
+    get_backend(db).remove(db, SearchKind.WIKI, wiki_id)
+
+
+def search(db: Session, query: str, limit: int, offset: int) -> List[SearchHit]:
+    return get_backend(db).search(db, query, limit, offset)
@@ -0,0 +1,153 @@
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import delete, func, inspect, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.change_log import ChangeEntity
+from app.models.sla import SlaPolicy
+from app.models.ticket import Ticket, TicketPriority, TicketStatus
+from app.services import change_feed, outbox
+from app.services.ticket_rollups import RESOLVED_STATUSES
+
+logger = logging.getLogger(__name__)
+
+PolicyKey = Tuple[Optional[int], TicketPriority]
+
+
+def load_policies(db: Session, keys: Set[Tuple[int, TicketPriority]]) -> Dict[PolicyKey, SlaPolicy]:
+    if not keys:
+        return {}
+    rows = db.scalars(
+        select(SlaPolicy).where(
+            SlaPolicy.priority.in_({priority for _, priority in keys}),
+            or_(SlaPolicy.project_id.in_({project_id for project_id, _ in keys}), SlaPolicy.project_id.is_(None)),
+        )
+    )
+    return {(policy.project_id, policy.priority): policy for policy in rows}
+
+
+def policy_for(policies: Dict[PolicyKey, SlaPolicy], project_id: int, priority: TicketPriority) -> Optional[SlaPolicy]:
+    return policies.get((project_id, priority)) or policies.get((None, priority))
+
+
+def project_deleted(db: Session, project_id: int) -> None:
+    db.execute(delete(SlaPolicy).where(SlaPolicy.project_id == project_id))
+
+
+def due_at(ticket: Ticket, policy: Optional[SlaPolicy]) -> Optional[datetime]:
+    if policy is None or ticket.status in RESOLVED_STATUSES:
+        return None
+    minutes = policy.resolution_minutes
+    if ticket.status == TicketStatus.PENDIENTE and policy.response_minutes:
+        minutes = policy.response_minutes
+    return ticket.created_at + timedelta(minutes=minutes)
+
+
+def set_deadline(ticket: Ticket, policy: Optional[SlaPolicy], now: datetime) -> None:
+    deadline = due_at(ticket, policy)
+    if deadline is not None and deadline > now:
+        ticket.sla_breached_at = None
+    ticket.sla_due_at = deadline
+
+
+def update_deadlines(db: Session, changes: Iterable[Tuple[Optional[Tuple[int, TicketStatus]], Ticket]]) -> None:
+    pending = [
+        ticket
+        for previous, ticket in changes
+        if previous is None or previous[1] != ticket.status or inspect(ticket).attrs["priority"].history.has_changes()
+    ]
+    if not pending:
+        return
+    policies = load_policies(db, {(ticket.project_id, ticket.priority) for ticket in pending})
+    now = datetime.utcnow()
+    for ticket in pending:
+        set_deadline(ticket, policy_for(policies, ticket.project_id, ticket.priority), now)
+
+
+def recompute(db: Session, batch_size: int) -> int:
+    policies = {(policy.project_id, policy.priority): policy for policy in db.scalars(select(SlaPolicy))}
+    now = datetime.utcnow()
+    last_id, total = 0, 0
+    while True:
+        tickets = db.scalars(
+            select(Ticket)
+            .where(Ticket.id > last_id, Ticket.status.not_in(list(RESOLVED_STATUSES)))
+            .order_by(Ticket.id)
+            .limit(batch_size)
+        ).all()
+        if not tickets:
+            return total
+        changed = []
+        for ticket in tickets:
+            previous = (ticket.sla_due_at, ticket.sla_breached_at)
+            set_deadline(ticket, policy_for(policies, ticket.project_id, ticket.priority), now)
+            if (ticket.sla_due_at, ticket.sla_breached_at) != previous:
+                changed.append(ticket.id)
+        change_feed.record(db, ChangeEntity.TICKET, changed)
+        db.commit()
+        total += len(changed)
+        last_id = tickets[-1].id
+
+
+def mark_breaches(db: Session, batch_size: int) -> int:
+    tickets = db.scalars(
+        select(Ticket)
+        .where(Ticket.sla_due_at <= datetime.utcnow(), Ticket.sla_breached_at.is_(None))
+        .order_by(Ticket.sla_due_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not tickets:
+        return 0
+    events = []
+    for ticket in tickets:
+        ticket.sla_breached_at = ticket.sla_due_at
+        events.append(
+            outbox.PendingTicketEvent(ticket, outbox.TICKET_SLA_BREACHED, {"sla_due_at": ticket.sla_due_at.isoformat()})
+        )
+    db.flush()
+    outbox.enqueue_ticket_events(db, events)
+    change_feed.record(db, ChangeEntity.TICKET, [ticket.id for ticket in tickets])
+    db.commit()
+    return len(tickets)
+
+
+def next_deadline(db: Session) -> Optional[datetime]:
+    return db.scalar(select(func.min(Ticket.sla_due_at)).where(Ticket.sla_breached_at.is_(None)))
+
+
+class SlaScheduler:
+    def run_once(self) -> int:
+        total = 0
+        with SessionLocal() as db:
+            while True:
+                marked = mark_breaches(db, settings.sla_scheduler_batch_size)
+                total += marked
+                if marked < settings.sla_scheduler_batch_size:
+                    return total
+
+    def seconds_until_next(self) -> float:
+        with SessionLocal() as db:
+            deadline = next_deadline(db)
+        if deadline is None:
+            return settings.sla_scheduler_poll_seconds
+        wait = (deadline - datetime.utcnow()).total_seconds()
+        return min(settings.sla_scheduler_poll_seconds, max(wait, 0.1))
+
+    def run_forever(self) -> None:
+        logger.info("Planificador de SLA en marcha (consulta cada %ss como máximo)", settings.sla_scheduler_poll_seconds)
+        while True:
+            try:
+                breached = self.run_once()
+                if breached:
+                    logger.info("Tickets con SLA incumplido: %s", breached)
+                wait = self.seconds_until_next()
+            except Exception:  # noqa: BLE001
+                logger.exception("Error comprobando los vencimientos de SLA")
+                wait = settings.sla_scheduler_poll_seconds
+            time.sleep(wait)
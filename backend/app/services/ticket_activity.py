@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert, inspect
+from sqlalchemy.orm import Session
+
+from app.models.ticket import Ticket, TicketStatus
+from app.models.ticket_activity import TicketActivity
+
+DELETED_FIELD = "deleted"
+TRACKED_FIELDS = ("project_id", "title", "description", "priority", "status", "assignee_id")
+
+
+@dataclass
+class FieldChange:
+    ticket: Ticket
+    field: str
+    old_value: Any
+    new_value: Any
+
+
+def _as_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def collect_changes(changes: Iterable[Tuple[Optional[Tuple[int, TicketStatus]], Ticket]]) -> List[FieldChange]:
+    collected = []
+    for previous, ticket in changes:
+        if previous is None:
+            continue
+        state = inspect(ticket)
+        for field in TRACKED_FIELDS:
+            history = state.attrs[field].history
+            if not history.added or not history.deleted:
+                continue
+            old_value, new_value = history.deleted[0], history.added[0]
+            if old_value != new_value:
+                collected.append(FieldChange(ticket, field, old_value, new_value))
+    return collected
+
+
+def record(db: Session, changes: List[FieldChange], actor_id: Optional[int]) -> None:
+    if not changes:
+        return
+    now = datetime.utcnow()
+    db.execute(
+        insert(TicketActivity).values(
+            [
+                {
+                    "ticket_id": change.ticket.id,
+                    "actor_id": actor_id,
+                    "field": change.field,
+                    "old_value": _as_text(change.old_value),
+                    "new_value": _as_text(change.new_value),
+                    "created_at": now,
+                }
+                for change in changes
+            ]
+        )
+    )
+
+
+def record_deleted(db: Session, ticket: Ticket, actor_id: Optional[int]) -> None:
+    db.execute(
+        insert(TicketActivity).values(
+            ticket_id=ticket.id,
+            actor_id=actor_id,
+            field=DELETED_FIELD,
+            old_value=ticket.title,
+            new_value=None,
+            created_at=datetime.utcnow(),
+        )
+    )
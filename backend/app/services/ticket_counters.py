@@ -0,0 +1,64 @@
+from collections import Counter
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.db.upsert import increment
+from app.models.ticket import Ticket, TicketStatus
+from app.models.ticket_counter import TicketStatusCount
+
+
+def adjust(db: Session, project_id: int, status: TicketStatus, delta: int) -> None:
+    increment(
+        db,
+        TicketStatusCount.__table__,
+        {"project_id": project_id, "status": status},
+        {"count": delta},
+    )
+
+
+def ticket_deleted(db: Session, ticket: Ticket) -> None:
+    adjust(db, ticket.project_id, ticket.status, -1)
+
+
+def project_deleted(db: Session, project_id: int) -> None:
+    db.execute(delete(TicketStatusCount).where(TicketStatusCount.project_id == project_id))
+
+
+def tickets_changed(db: Session, changes: Iterable[Tuple[Optional[Tuple[int, TicketStatus]], Ticket]]) -> None:
+    deltas: Counter = Counter()
+    for previous, ticket in changes:
+        if previous is not None:
+            deltas[previous] -= 1
+        deltas[(ticket.project_id, ticket.status)] += 1
+    for (project_id, status), delta in deltas.items():
+        if delta:
+            adjust(db, project_id, status, delta)
+
+
+def status_totals(db: Session, project_id: Optional[int] = None) -> Dict[TicketStatus, int]:
+    query = select(TicketStatusCount.status, func.sum(TicketStatusCount.count)).group_by(TicketStatusCount.status)
+    if project_id is not None:
+        query = query.where(TicketStatusCount.project_id == project_id)
+    return {status: int(count) for status, count in db.execute(query) if count}
+
+
+def rebuild(db: Session) -> int:
+    db.execute(delete(TicketStatusCount))
+    grouped = (
+        select(Ticket.project_id, Ticket.status, func.count())
+        .group_by(Ticket.project_id, Ticket.status)
+    )
+    db.execute(
+        insert(TicketStatusCount).from_select(["project_id", "status", "count"], grouped)
+    )
+    return db.scalar(select(func.count()).select_from(TicketStatusCount)) or 0
+
+
+def ensure_built(db: Session) -> None:
+    has_counters = db.query(TicketStatusCount.project_id).limit(1).scalar() is not None
+    has_tickets = db.query(Ticket.id).limit(1).scalar() is not None
+    if has_tickets and not has_counters:
+        rebuild(db)
+        db.commit()
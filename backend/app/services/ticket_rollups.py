@@ -0,0 +1,188 @@
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from enum import Enum
+from typing import Any, DefaultDict, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from app.db.upsert import increment
+from app.models.ticket import Ticket, TicketPriority, TicketStatus
+from app.models.ticket_rollup import TicketDailyStat
+
+RESOLVED_STATUSES = {TicketStatus.COMPLETADO, TicketStatus.CERRADO}
+
+Bucket = Tuple[date, int, TicketPriority]
+Deltas = DefaultDict[Bucket, Counter]
+
+
+class Granularity(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+@dataclass
+class RollupState:
+    project_id: int
+    priority: TicketPriority
+    created_at: datetime
+    resolved_at: Optional[datetime]
+
+    @classmethod
+    def of(cls, ticket: Ticket) -> "RollupState":
+        return cls(ticket.project_id, ticket.priority, ticket.created_at, ticket.resolved_at)
+
+
+def _add(deltas: Deltas, state: RollupState, sign: int) -> None:
+    deltas[(state.created_at.date(), state.project_id, state.priority)]["created"] += sign
+    if state.resolved_at is not None:
+        bucket = deltas[(state.resolved_at.date(), state.project_id, state.priority)]
+        bucket["resolved"] += sign
+        bucket["resolution_seconds"] += sign * int((state.resolved_at - state.created_at).total_seconds())
+
+
+def _apply(db: Session, deltas: Deltas) -> None:
+    for (day, project_id, priority), amounts in deltas.items():
+        amounts = {column: amount for column, amount in amounts.items() if amount}
+        if amounts:
+            increment(
+                db,
+                TicketDailyStat.__table__,
+                {"day": day, "project_id": project_id, "priority": priority},
+                {"created": 0, "resolved": 0, "resolution_seconds": 0, **amounts},
+            )
+
+
+def _previous_priority(ticket: Ticket) -> TicketPriority:
+    history = inspect(ticket).attrs["priority"].history
+    return history.deleted[0] if history.deleted else ticket.priority
+
+
+def track_resolution(
+    changes: Iterable[Tuple[Optional[Tuple[int, TicketStatus]], Ticket]]
+) -> List[Tuple[Optional[RollupState], Ticket]]:
+    now = datetime.utcnow()
+    tracked = []
+    for previous, ticket in changes:
+        old = None
+        if previous is not None:
+            old = RollupState(previous[0], _previous_priority(ticket), ticket.created_at, ticket.resolved_at)
+        elif ticket.created_at is None:
+            ticket.created_at = now
+        if ticket.status not in RESOLVED_STATUSES:
+            ticket.resolved_at = None
+        elif ticket.resolved_at is None:
+            ticket.resolved_at = now
+        tracked.append((old, ticket))
+    return tracked
+
+
+def tickets_changed(db: Session, tracked: List[Tuple[Optional[RollupState], Ticket]]) -> None:
+    deltas: Deltas = defaultdict(Counter)
+    for old, ticket in tracked:
+        if old is not None:
+            _add(deltas, old, -1)
+        _add(deltas, RollupState.of(ticket), 1)
+    _apply(db, deltas)
+
+
+def ticket_deleted(db: Session, ticket: Ticket) -> None:
+    deltas: Deltas = defaultdict(Counter)
+    _add(deltas, RollupState.of(ticket), -1)
+    _apply(db, deltas)
+
+
+def project_deleted(db: Session, project_id: int) -> None:
+    db.execute(delete(TicketDailyStat).where(TicketDailyStat.project_id == project_id))
+
+
+def rebuild(db: Session, batch_size: int = 5000) -> int:
+    db.execute(delete(TicketDailyStat))
+    deltas: Deltas = defaultdict(Counter)
+    rows = db.execute(
+        select(Ticket.project_id, Ticket.priority, Ticket.created_at, Ticket.resolved_at).execution_options(
+            yield_per=batch_size
+        )
+    )
+    for project_id, priority, created_at, resolved_at in rows:
+        _add(deltas, RollupState(project_id, priority, created_at, resolved_at), 1)
+    records = [
+        {
+            "day": day,
+            "project_id": project_id,
+            "priority": priority,
+            "created": amounts["created"],
+            "resolved": amounts["resolved"],
+            "resolution_seconds": amounts["resolution_seconds"],
+        }
+        for (day, project_id, priority), amounts in deltas.items()
+    ]
+    for start in range(0, len(records), batch_size):
+        db.execute(insert(TicketDailyStat), records[start:start + batch_size])
+    return len(records)
+
+
+def _period_start(day: date, granularity: Granularity) -> date:
+    if granularity == Granularity.WEEK:
+        return day - timedelta(days=day.weekday())
+    if granularity == Granularity.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def timeseries(
+    db: Session,
+    date_from: date,
+    date_to: date,
+    granularity: Granularity = Granularity.DAY,
+    project_id: Optional[int] = None,
+    priority: Optional[TicketPriority] = None,
+) -> List[Dict[str, Any]]:
+    conditions = []
+    if project_id is not None:
+        conditions.append(TicketDailyStat.project_id == project_id)
+    if priority is not None:
+        conditions.append(TicketDailyStat.priority == priority)
+
+    opened_before = db.execute(
+        select(func.sum(TicketDailyStat.created), func.sum(TicketDailyStat.resolved)).where(
+            TicketDailyStat.day < date_from, *conditions
+        )
+    ).one()
+    backlog = int(opened_before[0] or 0) - int(opened_before[1] or 0)
+
+    daily = {
+        day: (int(created), int(resolved), int(seconds))
+        for day, created, resolved, seconds in db.execute(
+            select(
+                TicketDailyStat.day,
+                func.sum(TicketDailyStat.created),
+                func.sum(TicketDailyStat.resolved),
+                func.sum(TicketDailyStat.resolution_seconds),
+            )
+            .where(TicketDailyStat.day >= date_from, TicketDailyStat.day <= date_to, *conditions)
+            .group_by(TicketDailyStat.day)
+        )
+    }
+
+    points: Dict[date, Dict[str, Any]] = {}
+    day = date_from
+    while day <= date_to:
+        created, resolved, seconds = daily.get(day, (0, 0, 0))
+        backlog += created - resolved
+        point = points.setdefault(
+            _period_start(day, granularity),
+            {"period": _period_start(day, granularity), "created": 0, "resolved": 0, "resolution_seconds": 0},
+        )
+        point["created"] += created
+        point["resolved"] += resolved
+        point["resolution_seconds"] += seconds
+        point["backlog"] = backlog
+        day += timedelta(days=1)
+
+    for point in points.values():
+        seconds = point.pop("resolution_seconds")
+        point["mean_resolution_hours"] = round(seconds / point["resolved"] / 3600, 2) if point["resolved"] else None
+    return list(points.values())
@@ -0,0 +1,149 @@
+import difflib
+import json
+import zlib
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.wiki import WikiPage
+from app.models.wiki_revision import WikiRevision
+
+
+class RevisionNotFoundError(LookupError):
+    pass
+
+
+def _pack(value) -> bytes:
+    return zlib.compress(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode())
+
+
+def _unpack(payload: bytes):
+    return json.loads(zlib.decompress(payload))
+
+
+def make_delta(base: str, target: str) -> list:
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    delta: list = []
+    matcher = difflib.SequenceMatcher(None, base_lines, target_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            delta.append([i1, i2])
+        elif tag in ("replace", "insert"):
+            delta.append("".join(target_lines[j1:j2]))
+    return delta
+
+
+def apply_delta(base: str, delta: list) -> str:
+    base_lines = base.splitlines(keepends=True)
+    parts = []
+    for op in delta:
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(base_lines[op[0]:op[1]])
+    return "".join(parts)
+
+
+def _latest_revision(db: Session, wiki_id: int) -> int:
+    return db.query(func.max(WikiRevision.revision)).filter(WikiRevision.wiki_id == wiki_id).scalar() or 0
+
+
+def _add_revision(
+    db: Session,
+    wiki_id: int,
+    revision: int,
+    title: str,
+    content: str,
+    previous_content: Optional[str],
+    author_id: Optional[int],
+) -> WikiRevision:
+    is_snapshot = previous_content is None or (revision - 1) % settings.wiki_snapshot_interval == 0
+    payload = content if is_snapshot else make_delta(previous_content, content)
+    record = WikiRevision(
+        wiki_id=wiki_id,
+        revision=revision,
+        author_id=author_id,
+        title=title,
+        is_snapshot=is_snapshot,
+        content_size=len(content),
+        payload=_pack(payload),
+    )
+    db.add(record)
+    return record
+
+
+def record_created(db: Session, wiki: WikiPage) -> None:
+    _add_revision(db, wiki.id, 1, wiki.title, wiki.content, None, wiki.author_id)
+
+
+def record_updated(
+    db: Session,
+    wiki: WikiPage,
+    previous_title: str,
+    previous_content: str,
+    author_id: int,
+) -> None:
+    if (wiki.title, wiki.content) == (previous_title, previous_content):
+        return
+    latest = _latest_revision(db, wiki.id)
+    if latest == 0:
+        _add_revision(db, wiki.id, 1, previous_title, previous_content, None, wiki.author_id)
+        latest = 1
+    _add_revision(db, wiki.id, latest + 1, wiki.title, wiki.content, previous_content, author_id)
+
+
+def list_revisions(db: Session, wiki_id: int) -> List[Tuple[WikiRevision, int]]:
+    rows = (
+        db.query(WikiRevision, func.length(WikiRevision.payload))
+        .filter(WikiRevision.wiki_id == wiki_id)
+        .order_by(WikiRevision.revision.desc())
+        .all()
+    )
+    return [(revision, stored_size) for revision, stored_size in rows]
+
+
+def get_revision(db: Session, wiki_id: int, revision: int) -> Tuple[WikiRevision, str]:
+    snapshot = (
+        db.query(func.max(WikiRevision.revision))
+        .filter(
+            WikiRevision.wiki_id == wiki_id,
+            WikiRevision.revision <= revision,
+            WikiRevision.is_snapshot.is_(True),
+        )
+        .scalar()
+    )
+    if snapshot is None:
+        raise RevisionNotFoundError(revision)
+    chain = (
+        db.query(WikiRevision)
+        .filter(WikiRevision.wiki_id == wiki_id, WikiRevision.revision.between(snapshot, revision))
+        .order_by(WikiRevision.revision)
+        .all()
+    )
+    if not chain or chain[-1].revision != revision:
+        raise RevisionNotFoundError(revision)
+
+    content = _unpack(chain[0].payload)
+    for record in chain[1:]:
+        content = apply_delta(content, _unpack(record.payload))
+    return chain[-1], content
+
+
+def diff_revisions(db: Session, wiki_id: int, from_revision: int, to_revision: int) -> str:
+    _, old = get_revision(db, wiki_id, from_revision)
+    _, new = get_revision(db, wiki_id, to_revision)
+    return "".join(
+        difflib.unified_diff(
+            old.splitlines(keepends=True),
+            new.splitlines(keepends=True),
+            fromfile=f"r{from_revision}",
+            tofile=f"r{to_revision}",
+        )
+    )
+
+
+def delete_history(db: Session, wiki_id: int) -> None:
+    db.query(WikiRevision).filter(WikiRevision.wiki_id == wiki_id).delete(synchronize_session=False)
@@ -0,0 +1,57 @@
+import argparse
+import json
+from typing import Any, Dict, List, Optional
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "throughput_rps", "sql_per_request")
+HIGHER_IS_BETTER = {"throughput_rps"}
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def change(before: Optional[float], after: Optional[float]) -> Optional[float]:
+    if before is None or after is None or before == 0:
+        return None
+    return round((after - before) / before * 100, 1)
+
+
+def regressions(metric: str, delta: Optional[float], threshold: float) -> bool:
+    if delta is None or metric == "sql_per_request":
+        return False
+    return -delta > threshold if metric in HIGHER_IS_BETTER else delta > threshold
+
+
+def compare(baseline: Dict[str, Any], candidate: Dict[str, Any], threshold: float) -> Dict[str, Any]:
+    rows: Dict[str, Any] = {}
+    flagged: List[str] = []
+    for name, before in baseline["results"].items():
+        after = candidate["results"].get(name)
+        if after is None:
+            continue
+        row = {}
+        for metric in METRICS:
+            delta = change(before.get(metric), after.get(metric))
+            row[metric] = {"before": before.get(metric), "after": after.get(metric), "change_pct": delta}
+            if regressions(metric, delta, threshold):
+                flagged.append(f"{name}.{metric}")
+        if before.get("sql_per_request") is not None and after.get("sql_per_request", 0) > before["sql_per_request"]:
+            flagged.append(f"{name}.sql_per_request")
+        rows[name] = row
+    return {"baseline": baseline["meta"], "candidate": candidate["meta"], "threshold_pct": threshold, "regressions": flagged, "results": rows}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Compara dos ejecuciones de benchmarks.suite")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Porcentaje de empeoramiento tolerado en latencias y throughput")
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    report = compare(load(args.baseline), load(args.candidate), args.threshold)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    raise SystemExit(1 if report["regressions"] else 0)
@@ -0,0 +1,204 @@
+import argparse
+import logging
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Sequence
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.db import migrations
+from app.db.base import Base
+from app.db.session import SessionLocal, engine
+from app.main import init_db
+from app.models import InventoryItem, Project, Ticket, User, UserRole, WikiPage
+from app.models.inventory import InventoryStatus, InventoryType
+from app.models.ticket import TicketPriority, TicketStatus
+from app.services import search, ticket_counters, ticket_rollups
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_PASSWORD = "benchmark123"
+WORDS = (
+    "servidor red impresora acceso correo copia seguridad factura cliente portátil monitor "
+    "contraseña despliegue migración base datos informe incidencia licencia actualización error"
+).split()
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def insert_batches(db: Session, model: Any, rows: Iterable[Dict[str, Any]], batch_size: int) -> int:
+    total = 0
+    batch: List[Dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            db.execute(insert(model), batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        db.execute(insert(model), batch)
+        total += len(batch)
+    db.commit()
+    return total
+
+
+def ids_for(db: Session, column: Any, condition: Any) -> Sequence[int]:
+    return db.scalars(select(column).where(condition)).all()
+
+
+def seed(db: Session, args: argparse.Namespace) -> Dict[str, int]:
+    rng = random.Random(args.seed)
+    tag = uuid.uuid4().hex[:8]
+    now = datetime.utcnow()
+    hashed_password = get_password_hash(BENCHMARK_PASSWORD)
+
+    def moment(index: int) -> datetime:
+        return now - timedelta(minutes=index)
+
+    counts = {}
+    counts["users"] = insert_batches(
+        db,
+        User,
+        (
+            {
+                "email": f"bench-{tag}-{index}@example.com",
+                "full_name": f"Usuario {index}",
+                "hashed_password": hashed_password,
+                "role": UserRole.JEFE_PROYECTO if index % 10 == 0 else UserRole.USUARIO,
+                "is_active": True,
+                "two_factor_enabled": False,
+                "created_at": moment(index),
+                "updated_at": moment(index),
+            }
+            for index in range(args.users)
+        ),
+        args.batch_size,
+    )
+    user_ids = ids_for(db, User.id, User.email.like(f"bench-{tag}-%"))
+
+    counts["projects"] = insert_batches(
+        db,
+        Project,
+        (
+            {
+                "name": f"Proyecto {tag}-{index}",
+                "description": sentence(rng, 12),
+                "project_manager_id": rng.choice(user_ids),
+                "created_at": moment(index),
+                "updated_at": moment(index),
+            }
+            for index in range(args.projects)
+        ),
+        args.batch_size,
+    )
+    project_ids = ids_for(db, Project.id, Project.name.like(f"Proyecto {tag}-%"))
+
+    priorities = list(TicketPriority)
+    statuses = list(TicketStatus)
+    counts["tickets"] = insert_batches(
+        db,
+        Ticket,
+        (
+            {
+                "project_id": rng.choice(project_ids),
+                "reporter_id": rng.choice(user_ids),
+                "assignee_id": rng.choice(user_ids) if rng.random() < 0.7 else None,
+                "title": f"{sentence(rng, 5)} #{index}",
+                "description": sentence(rng, 40),
+                "priority": rng.choice(priorities),
+                "status": rng.choice(statuses),
+                "created_at": moment(index),
+                "updated_at": moment(index),
+            }
+            for index in range(args.tickets)
+        ),
+        args.batch_size,
+    )
+
+    counts["wikis"] = insert_batches(
+        db,
+        WikiPage,
+        (
+            {
+                "project_id": rng.choice(project_ids),
+                "author_id": rng.choice(user_ids),
+                "title": f"{sentence(rng, 4)} #{index}",
+                "content": "\n".join(sentence(rng, 15) for _ in range(30)),
+                "created_at": moment(index),
+                "updated_at": moment(index),
+            }
+            for index in range(args.wikis)
+        ),
+        args.batch_size,
+    )
+
+    types = list(InventoryType)
+    counts["inventory"] = insert_batches(
+        db,
+        InventoryItem,
+        (
+            {
+                "name": f"{rng.choice(types).value.title()} {index}",
+                "type": rng.choice(types),
+                "serial_number": f"SN-{tag}-{index:08d}",
+                "assigned_user_id": rng.choice(user_ids) if rng.random() < 0.5 else None,
+                "assigned_project_id": rng.choice(project_ids) if rng.random() < 0.3 else None,
+                "status": rng.choice(list(InventoryStatus)),
+                "purchase_date": (now - timedelta(days=rng.randint(0, 1500))).date(),
+                "notes": sentence(rng, 8),
+                "created_at": moment(index),
+                "updated_at": moment(index),
+            }
+            for index in range(args.inventory)
+        ),
+        args.batch_size,
+    )
+    return counts
+
+
+def rebuild_derived_data(db: Session) -> None:
+    ticket_counters.rebuild(db)
+    ticket_rollups.rebuild(db)
+    search.get_backend(db).rebuild(db)
+    db.commit()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos en la base de datos configurada (database_url)")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--tickets", type=int, default=20_000)
+    parser.add_argument("--wikis", type=int, default=500)
+    parser.add_argument("--inventory", type=int, default=2_000)
+    parser.add_argument("--batch-size", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=42, help="Semilla del generador aleatorio")
+    parser.add_argument("--reset", action="store_true", help="Borra todas las tablas antes de generar los datos")
+    return parser
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    args = build_parser().parse_args()
+    if args.users < 1 or args.projects < 1:
+        raise SystemExit("Se necesita al menos un usuario y un proyecto")
+    if args.reset:
+        Base.metadata.drop_all(bind=engine)
+        migrations.schema_version.drop(bind=engine, checkfirst=True)
+    init_db()
+
+    db = SessionLocal()
+    try:
+        counts = seed(db, args)
+        rebuild_derived_data(db)
+    finally:
+        db.close()
+    logger.info("Datos generados: %s (contraseña de los usuarios: %s)", counts, BENCHMARK_PASSWORD)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.api.projection import rows_to_dicts, schema_columns
+from app.db.base import Base
+from app.models import Project, Ticket, User
+from app.models.ticket import TicketPriority, TicketStatus
+from app.schemas.ticket import TicketOut
+
+
+def seed(db: Session, rows: int) -> None:
+    now = datetime.utcnow()
+    db.execute(
+        insert(User),
+        [{"id": 1, "email": "bench@example.com", "full_name": "Bench", "hashed_password": "-", "created_at": now, "updated_at": now}],
+    )
+    db.execute(insert(Project), [{"id": 1, "name": "Bench", "created_at": now, "updated_at": now}])
+    priorities = list(TicketPriority)
+    statuses = list(TicketStatus)
+    db.execute(
+        insert(Ticket),
+        [
+            {
+                "project_id": 1,
+                "reporter_id": 1,
+                "assignee_id": 1 if index % 2 else None,
+                "title": f"Ticket {index}",
+                "description": "Descripción de prueba " * 4,
+                "priority": priorities[index % len(priorities)],
+                "status": statuses[index % len(statuses)],
+                "created_at": now - timedelta(seconds=index),
+                "updated_at": now - timedelta(seconds=index),
+            }
+            for index in range(rows)
+        ],
+    )
+    db.commit()
+
+
+def orm_path(db: Session) -> bytes:
+    tickets = db.scalars(select(Ticket).order_by(Ticket.created_at.desc(), Ticket.id.desc())).all()
+    items = [TicketOut.from_orm(ticket) for ticket in tickets]
+    return JSONResponse(jsonable_encoder(items)).body
+
+
+def projected_path(db: Session) -> bytes:
+    statement = select(*schema_columns(Ticket, TicketOut)).order_by(Ticket.created_at.desc(), Ticket.id.desc())
+    rows = db.execute(statement).all()
+    return ORJSONResponse(rows_to_dicts(rows, list(TicketOut.__fields__))).body
+
+
+def best_of(db: Session, path: Callable[[Session], bytes], repeat: int) -> Dict[str, float]:
+    timings: List[float] = []
+    size = 0
+    for _ in range(repeat):
+        db.expunge_all()
+        start = time.perf_counter()
+        size = len(path(db))
+        timings.append(time.perf_counter() - start)
+    return {"best_ms": round(min(timings) * 1000, 1), "bytes": size}
+
+
+def run(rows: int, repeat: int) -> Dict[str, object]:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        seed(db, rows)
+        orm = best_of(db, orm_path, repeat)
+        projected = best_of(db, projected_path, repeat)
+    engine.dispose()
+    return {
+        "rows": rows,
+        "orm_from_orm": orm,
+        "projected_orjson": projected,
+        "speedup": round(orm["best_ms"] / projected["best_ms"], 2) if projected["best_ms"] else None,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Compara la serialización ORM + from_orm con la proyección de columnas + orjson")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    print(json.dumps([run(rows, args.repeat) for rows in args.rows], indent=2))
@@ -0,0 +1,196 @@
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import httpx
+from sqlalchemy import event
+
+from benchmarks.concurrency import percentile
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    method: str
+    path: str
+    body: Optional[Dict[str, Any]] = None
+    authenticated: bool = True
+
+
+class StatementCounter:
+    def __init__(self, engines: List[Any]) -> None:
+        self.count = 0
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *_: Any) -> None:
+        self.count += 1
+
+    def reset(self) -> None:
+        self.count = 0
+
+
+def build_scenarios(ids: Dict[str, Optional[int]], email: str, password: str) -> List[Scenario]:
+    scenarios = [
+        Scenario("auth.login", "POST", "/api/auth/login", {"email": email, "password": password}, authenticated=False),
+        Scenario("users.me", "GET", "/api/users/me"),
+        Scenario("users.list", "GET", "/api/users/"),
+        Scenario("projects.list", "GET", "/api/projects/"),
+        Scenario("tickets.list", "GET", "/api/tickets/?limit=50"),
+        Scenario("tickets.list_filtered", "GET", f"/api/tickets/?limit=50&status=PENDIENTE&project_id={ids['project'] or 0}"),
+        Scenario("wikis.list", "GET", "/api/wikis/"),
+        Scenario("inventory.list", "GET", "/api/inventory/"),
+        Scenario("dashboard.stats", "GET", "/api/dashboard/stats"),
+        Scenario("dashboard.timeseries", "GET", f"/api/dashboard/timeseries?from={date.today() - timedelta(days=365)}&granularity=week"),
+        Scenario("search.query", "GET", "/api/search?q=servidor&limit=20"),
+    ]
+    if ids["project"]:
+        scenarios.append(Scenario("projects.get", "GET", f"/api/projects/{ids['project']}"))
+    if ids["ticket"]:
+        scenarios.append(Scenario("tickets.get", "GET", f"/api/tickets/{ids['ticket']}"))
+    if ids["wiki"]:
+        scenarios.append(Scenario("wikis.revisions", "GET", f"/api/wikis/{ids['wiki']}/revisions"))
+    return scenarios
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> Dict[str, str]:
+    response = await client.post("/api/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    token = response.json().get("access_token")
+    if not token:
+        raise SystemExit("El usuario del benchmark tiene 2FA activado; usa otro con --email")
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def discover_ids(client: httpx.AsyncClient, headers: Dict[str, str]) -> Dict[str, Optional[int]]:
+    async def first_id(path: str, key: Optional[str] = None) -> Optional[int]:
+        response = await client.get(path, headers=headers)
+        response.raise_for_status()
+        items = response.json()
+        if key:
+            items = items[key]
+        return items[0]["id"] if items else None
+
+    return {
+        "project": await first_id("/api/projects/"),
+        "ticket": await first_id("/api/tickets/?limit=1", "items"),
+        "wiki": await first_id("/api/wikis/"),
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    concurrency: int,
+    total: int,
+    headers: Dict[str, str],
+    counter: Optional[StatementCounter],
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(total))
+    request_headers = headers if scenario.authenticated else {}
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, scenario.path, json=scenario.body, headers=request_headers)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    if counter is not None:
+        counter.reset()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "method": scenario.method,
+        "path": scenario.path,
+        "requests": total,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "sql_per_request": round(counter.count / total, 2) if counter is not None and total else None,
+    }
+
+
+def in_process_client(args: argparse.Namespace) -> tuple:
+    from app.db.session import async_engine, engine
+    from app.main import app, init_db
+
+    init_db()
+    transport = httpx.ASGITransport(app=app)
+    client = httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=args.timeout)
+    return client, StatementCounter([engine, async_engine.sync_engine]), engine.dialect.name
+
+
+async def main(args: argparse.Namespace) -> Dict[str, Any]:
+    if args.url:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        client = httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout)
+        counter, dialect = None, None
+    else:
+        client, counter, dialect = in_process_client(args)
+
+    async with client:
+        headers = await login(client, args.email, args.password)
+        ids = await discover_ids(client, headers)
+        scenarios = build_scenarios(ids, args.email, args.password)
+        if args.only:
+            scenarios = [scenario for scenario in scenarios if scenario.name in args.only]
+        results = {}
+        for scenario in scenarios:
+            total = args.login_requests if scenario.name == "auth.login" else args.requests
+            results[scenario.name] = await run_scenario(client, scenario, args.concurrency, total, headers, counter)
+
+    return {
+        "meta": {
+            "label": args.label,
+            "started_at": datetime.utcnow().isoformat(),
+            "target": args.url or "in-process",
+            "database": dialect,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+        },
+        "results": results,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Ejecuta la batería de benchmarks sobre todos los routers de la API")
+    parser.add_argument("--url", help="URL de un servidor en marcha; sin ella la app se ejecuta en proceso y se cuentan las sentencias SQL")
+    parser.add_argument("--email", default="admin@helpdesk.com")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=500, help="Peticiones por escenario")
+    parser.add_argument("--login-requests", type=int, default=50, help="Peticiones para auth.login (bcrypt es caro)")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--only", nargs="*", help="Nombres de los escenarios a ejecutar")
+    parser.add_argument("--label", default="", help="Etiqueta libre para identificar la ejecución")
+    parser.add_argument("--output", help="Fichero JSON donde guardar el resultado")
+    return parser
+
+
+if __name__ == "__main__":
+    arguments = build_parser().parse_args()
+    report = asyncio.run(main(arguments))
+    body = json.dumps(report, indent=2, ensure_ascii=False)
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as handle:
+            handle.write(body + "\n")
+    print(body)
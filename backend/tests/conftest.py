@@ -0,0 +1,44 @@
+import os
+import tempfile
+
+os.environ.setdefault("database_url", os.environ.get("TEST_DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/octopus-test.db")
+
+import pytest  # noqa: E402
+from sqlalchemy import delete  # noqa: E402
+
+from app import models  # noqa: E402,F401
+from app.db import migrations  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.models.outbox import OutboxEvent  # noqa: E402
+from tests.standins import SmtpStandIn, WebhookStandIn, serve  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    migrations.upgrade(engine)
+
+
+@pytest.fixture
+def db():
+    with SessionLocal() as session:
+        session.execute(delete(OutboxEvent))
+        session.commit()
+        yield session
+
+
+@pytest.fixture
+def smtp_server():
+    server = SmtpStandIn()
+    serve(server)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def webhook_server():
+    server = WebhookStandIn()
+    serve(server)
+    yield server
+    server.shutdown()
+    server.server_close()
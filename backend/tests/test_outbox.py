@@ -0,0 +1,199 @@
+import hashlib
+import hmac
+import json
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.dialects import mysql
+
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from app.models.outbox import OutboxChannel, OutboxEvent, OutboxStatus
+from app.models.project import Project
+from app.models.ticket import Ticket
+from app.models.user import User, UserRole
+from app.services import outbox
+from app.services.outbox import OutboxWorker
+
+
+@pytest.fixture
+def ticket(db):
+    suffix = datetime.utcnow().strftime("%H%M%S%f")
+    reporter = User(
+        email=f"reporter-{suffix}@example.com",
+        full_name="Reporter",
+        hashed_password="-",
+        role=UserRole.USUARIO,
+        is_active=True,
+    )
+    assignee = User(
+        email=f"assignee-{suffix}@example.com",
+        full_name="Assignee",
+        hashed_password="-",
+        role=UserRole.USUARIO,
+        is_active=True,
+    )
+    project = Project(name=f"Outbox {suffix}")
+    db.add_all([reporter, assignee, project])
+    db.flush()
+    ticket = Ticket(project_id=project.id, reporter_id=reporter.id, assignee_id=assignee.id, title="Impresora rota")
+    db.add(ticket)
+    db.commit()
+    return ticket
+
+
+@pytest.fixture
+def channels(monkeypatch, smtp_server, webhook_server):
+    monkeypatch.setattr(settings, "smtp_host", "127.0.0.1")
+    monkeypatch.setattr(settings, "smtp_port", smtp_server.port)
+    monkeypatch.setattr(settings, "smtp_timeout_seconds", 5)
+    monkeypatch.setattr(settings, "notifications_email_enabled", True)
+    monkeypatch.setattr(settings, "webhook_urls", [webhook_server.url])
+    monkeypatch.setattr(settings, "webhook_secret", "s3cret")
+    monkeypatch.setattr(settings, "webhook_timeout_seconds", 5)
+    monkeypatch.setattr(settings, "outbox_backoff_seconds", 30)
+    monkeypatch.setattr(settings, "outbox_max_attempts", 3)
+    return smtp_server, webhook_server
+
+
+@pytest.fixture
+def worker(channels):
+    worker = OutboxWorker()
+    yield worker
+    worker.close()
+
+
+def enqueue(db, ticket, event_type=outbox.TICKET_CREATED):
+    outbox.enqueue_ticket_events(db, [outbox.PendingTicketEvent(ticket, event_type, {})])
+    db.commit()
+
+
+def events(db, channel=None):
+    db.expire_all()
+    statement = select(OutboxEvent).order_by(OutboxEvent.id)
+    if channel is not None:
+        statement = statement.where(OutboxEvent.channel == channel)
+    return db.scalars(statement).all()
+
+
+def make_due(db):
+    db.execute(update(OutboxEvent).values(next_attempt_at=datetime.utcnow() - timedelta(seconds=1)))
+    db.commit()
+
+
+def test_delivers_email_and_signed_webhook(db, ticket, worker, channels):
+    smtp_server, webhook_server = channels
+    enqueue(db, ticket)
+
+    assert worker.run_once() == 2
+
+    [(recipients, message)] = smtp_server.received
+    assert sorted(recipients) == sorted([ticket.reporter.email, ticket.assignee.email])
+    assert message["Subject"] == f"Nuevo ticket #{ticket.id}: Impresora rota"
+    [(path, headers, payload)] = webhook_server.received
+    assert path == "/hooks/octopus"
+    assert headers["X-Octopus-Event"] == outbox.TICKET_CREATED
+    body = json.dumps(payload, ensure_ascii=False).encode()
+    assert headers["X-Octopus-Signature"] == "sha256=" + hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+    assert payload["ticket"]["id"] == ticket.id
+    for event in events(db):
+        assert event.status == OutboxStatus.ENVIADO
+        assert event.attempts == 1
+        assert event.delivered_at is not None
+        assert event.locked_until is None
+        assert event.last_error is None
+
+
+def test_failed_webhook_is_retried_with_backoff(db, ticket, worker, channels):
+    _, webhook_server = channels
+    webhook_server.statuses = [500]
+    enqueue(db, ticket)
+    started = datetime.utcnow()
+
+    worker.run_once()
+
+    [event] = events(db, OutboxChannel.WEBHOOK)
+    assert event.status == OutboxStatus.PENDIENTE
+    assert event.attempts == 1
+    assert "HTTP 500" in event.last_error
+    delay = (event.next_attempt_at - started).total_seconds()
+    assert 30 * 0.8 - 1 <= delay <= 30 * 1.2 + 1
+    assert worker.run_once() == 0
+
+    make_due(db)
+    assert worker.run_once() == 1
+
+    [event] = events(db, OutboxChannel.WEBHOOK)
+    assert event.status == OutboxStatus.ENVIADO
+    assert event.attempts == 2
+    assert event.last_error is None
+    assert len(webhook_server.received) == 2
+
+
+def test_backoff_grows_exponentially_up_to_the_cap(monkeypatch):
+    monkeypatch.setattr(settings, "outbox_backoff_seconds", 10)
+    monkeypatch.setattr(settings, "outbox_backoff_max_seconds", 60)
+    assert 8 <= outbox.backoff_delay(1) <= 12
+    assert 16 <= outbox.backoff_delay(2) <= 24
+    assert 48 <= outbox.backoff_delay(5) <= 72
+
+
+def test_gives_up_after_max_attempts(db, ticket, worker):
+    worker.email_sender.port = 1
+    enqueue(db, ticket)
+
+    for _ in range(settings.outbox_max_attempts):
+        make_due(db)
+        worker.run_once()
+
+    [event] = events(db, OutboxChannel.EMAIL)
+    assert event.status == OutboxStatus.FALLIDO
+    assert event.attempts == settings.outbox_max_attempts
+    assert event.last_error.startswith("SMTP:")
+    make_due(db)
+    assert worker.run_once() == 0
+
+
+def test_claim_leases_events_until_they_expire(db, ticket, worker):
+    enqueue(db, ticket)
+
+    claimed = worker.claim()
+
+    assert len(claimed) == 2
+    for event in events(db):
+        assert event.status == OutboxStatus.PROCESANDO
+        assert event.locked_until > datetime.utcnow()
+    assert worker.claim() == []
+
+    db.execute(update(OutboxEvent).values(locked_until=datetime.utcnow() - timedelta(seconds=1)))
+    db.commit()
+    assert sorted(event.id for event in worker.claim()) == sorted(event.id for event in claimed)
+
+
+def test_claim_query_skips_locked_rows():
+    statement = outbox.claimable(datetime.utcnow(), 10)
+    assert "FOR UPDATE SKIP LOCKED" in str(statement.compile(dialect=mysql.dialect()))
+
+
+@pytest.mark.skipif(engine.dialect.name != "mysql", reason="SKIP LOCKED solo se puede ejercitar en MySQL")
+def test_concurrent_claims_do_not_overlap(db, ticket, worker, monkeypatch):
+    monkeypatch.setattr(settings, "webhook_urls", [f"http://127.0.0.1:1/{index}" for index in range(20)])
+    enqueue(db, ticket)
+    monkeypatch.setattr(settings, "outbox_batch_size", 5)
+
+    holder = SessionLocal()
+    locked = holder.scalars(outbox.claimable(datetime.utcnow(), 5)).all()
+    claims = []
+    threads = [threading.Thread(target=lambda: claims.append(worker.claim())) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    holder.rollback()
+    holder.close()
+
+    claimed_ids = [event.id for claim in claims for event in claim]
+    assert len(claimed_ids) == len(set(claimed_ids)) == 15
+    assert not {row.id for row in locked} & set(claimed_ids)